@@ -1,42 +1,40 @@
-from flask import Flask, render_template, request, jsonify, send_file, session
-from backend.chatbot_engine import Chatbot
-from backend.resume_generator import ResumeGenerator
-from backend.ats_analyzer import ATSAnalyzer
-from backend.database import Database
-from data_models.user_model import UserData
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, send_file, session, g
+from backend.admission import AdmissionController, Shed
+from backend.components import Components
+from backend import services as resume_services
 from pydantic import ValidationError
-from utils.file_upload import FileUploader
-from utils.nlp_processor import NLPProcessor
-from utils.progress_tracker import ProgressTracker
+from utils.profiler import profiling
+from utils.config import ConfigError, ConfigStore, Settings
+from utils.logging_setup import setup_logging
+from utils.nlp_processor import ANALYSIS_LEVELS, DEEP
+import functools
 import os
-import yaml
 from datetime import datetime
 import logging
-from werkzeug.utils import secure_filename
-from typing import Dict, Any
+import threading
+from typing import Callable, Optional, Union
 from http import HTTPStatus
 
-# Initialize Flask app with proper configurations
-app = Flask(__name__)
-app.secret_key = os.urandom(24)
-
-def load_config() -> Dict[str, Any]:
-    """Load and validate configuration"""
-    if not os.path.exists('config.yaml'):
-        raise FileNotFoundError("config.yaml not found. Please ensure it exists in the root directory.")
-    with open("config.yaml") as f:
-        return yaml.safe_load(f)
-
-def setup_logging(config: Dict[str, Any]) -> None:
-    """Configure logging with rotation"""
-    os.makedirs('logs', exist_ok=True)
-    logging.basicConfig(
-        filename=os.path.join('logs', 'app.log'),
-        level=config.get('logging', {}).get('level', logging.INFO),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-
-def create_required_directories(config: Dict[str, Any]) -> None:
+bp = Blueprint('resume_builder', __name__)
+
+# Values that must never sign sessions: the session id is the key to a user's stored data
+PLACEHOLDER_SECRET_KEYS = frozenset({'', 'your-secret-key-here'})
+
+def resolve_secret_key(config: Settings) -> str:
+    """SECRET_KEY from the environment, else app.secret_key.
+
+    A missing or placeholder key is refused unless app.debug is set, in which case a
+    random key is generated (shared by workers forked after this call)."""
+    key = os.environ.get('SECRET_KEY') or str(config['app'].get('secret_key') or '')
+    if key not in PLACEHOLDER_SECRET_KEYS:
+        return key
+    if config['app'].get('debug'):
+        logging.warning("No SECRET_KEY configured; using a random key, sessions will not survive a restart")
+        return os.urandom(32).hex()
+    raise ConfigError("Set the SECRET_KEY environment variable (or app.secret_key) to a random value; "
+                      "the placeholder key would let anyone forge session cookies")
+
+def create_required_directories(config: Settings) -> None:
     """Create necessary directories"""
     directories = [
         config['storage']['image_upload_dir'],
@@ -49,28 +47,42 @@ def create_required_directories(config: Dict[str, Any]) -> None:
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
 
-# Load configuration and setup directories/logging
-config = load_config()
-setup_logging(config)
-create_required_directories(config)
-
-# Initialize components
-try:
-    chatbot = Chatbot()
-    resume_gen = ResumeGenerator()
-    ats_analyzer = ATSAnalyzer()
-    db = Database()
-    nlp_processor = NLPProcessor()
-    progress_tracker = ProgressTracker()
-    
-    file_uploader = FileUploader(
-        upload_folder=config['storage']['image_upload_dir'],
-        allowed_extensions=config['storage']['allowed_extensions'],
-        max_size_mb=config['storage']['max_file_size_bytes'] // (1024 * 1024)
-    )
-except Exception as e:
-    logging.critical(f"Failed to initialize components: {str(e)}")
-    raise
+def create_app(config_path: str = 'config.yaml', warmup: bool = False,
+               config_store: Optional[ConfigStore] = None) -> Flask:
+    """Application factory.
+
+    Only configuration is loaded here; services are built lazily on first use.
+    Pass ``warmup=True`` (or call ``app.extensions['components'].warmup()``) in a
+    pre-fork master to load the spaCy models once and share them with workers.
+    """
+    config_store = config_store or ConfigStore(config_path)
+    config = config_store.get()
+    setup_logging(config)
+    create_required_directories(config)
+    profiling.configure(config)
+
+    app = Flask(__name__)
+    # One key for all workers so each can read sessions signed by the others
+    app.secret_key = resolve_secret_key(config)
+    app.config['MAX_CONTENT_LENGTH'] = config['storage']['max_file_size_bytes']
+    app.extensions['config_store'] = config_store
+    app.extensions['components'] = Components(config_store)
+    app.extensions['admission'] = AdmissionController(config)
+    app.register_blueprint(bp)
+
+    if warmup:
+        try:
+            app.extensions['components'].warmup()
+        except Exception as e:
+            logging.critical("Failed to initialize components: %s", e)
+            raise
+    return app
+
+def components() -> Components:
+    return current_app.extensions['components']
+
+def current_config() -> Settings:
+    return current_app.extensions['config_store'].get()
 
 def get_session_id() -> str:
     """Generate or retrieve session ID"""
@@ -79,109 +91,121 @@ def get_session_id() -> str:
 def handle_api_error(e: Exception, status_code: int = HTTPStatus.INTERNAL_SERVER_ERROR) -> tuple:
     """Centralized API error handling"""
     error_message = str(e) if isinstance(e, ValidationError) else "Internal server error"
-    logging.error(f"API error: {str(e)}", exc_info=True)
+    logging.error("API error: %s", e, exc_info=True)
     return jsonify({'error': error_message}), status_code
 
-@app.route('/')
-@app.route('/')
+def shed_response(e: Shed) -> tuple:
+    return jsonify({'error': e.reason, 'retry_after': e.retry_after}), e.status, {'Retry-After': str(e.retry_after)}
+
+def admission_controlled(work_class: Union[str, Callable[[], Optional[str]], None] = None):
+    """Admit the view through the session rate limit and its work class, or shed it.
+
+    ``work_class`` may be a callable for routes whose cost depends on the request."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            name = work_class() if callable(work_class) else work_class
+            admission = current_app.extensions['admission']
+            try:
+                with admission.admit(session.get('session_id') or request.remote_addr, name):
+                    return view(*args, **kwargs)
+            except Shed as e:
+                return shed_response(e)
+        return wrapper
+    return decorator
+
+def analysis_work_class() -> Optional[str]:
+    """Only deep analyses occupy an NLP slot; tokenizer-only ones just count against the session"""
+    payload = request.get_json(silent=True) or {}
+    level = payload.get('level') or current_config()['nlp'].get('analysis_level', DEEP)
+    return 'deep_nlp' if level == DEEP else None
+
+@bp.before_app_request
+def start_request_profile():
+    """Sample the current request when it carries a valid profiling header"""
+    if profiling.enabled and profiling.authorized(request.headers.get(profiling.header)):
+        g.profiler = profiling.start(f"request_{request.endpoint}", thread_ids={threading.get_ident()})
+
+@bp.teardown_app_request
+def finish_request_profile(exc=None):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiling.finish(profiler)
+
+@bp.route('/')
+@bp.route('/')
 def home():
     """Render main chat interface with session initialization"""
     try:
+        services = components()
         session_id = get_session_id()
         session['session_id'] = session_id
-        if session_id not in chatbot.sessions:
-            chatbot._initialize_session(session_id)
-        progress_tracker.reset_progress(session_id)
-        return render_template('index.html', config=config)
+        if session_id not in services.chatbot.sessions:
+            services.chatbot._initialize_session(session_id)
+        services.progress_tracker.reset_progress(session_id)
+        return render_template('index.html', config=current_config())
     except Exception as e:
-        logging.critical(f"Session initialization failed: {str(e)}", exc_info=True)
+        logging.critical("Session initialization failed: %s", e, exc_info=True)
         # Instead of showing an error page, you could redirect to home   
-        return render_template('index.html', config=config), HTTPStatus.INTERNAL_SERVER_ERROR
+        return render_template('index.html', config=current_config()), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/chat', methods=['POST'])
+@bp.route('/chat', methods=['POST'])
 def handle_chat():
     """Handle chat messages with NLP integration and progress tracking"""
     try:
+        services = components()
         session_id = session.get('session_id')
         user_message = request.json.get('message', '').strip()
         if not user_message:
             return jsonify({'error': 'Empty message received'}), HTTPStatus.BAD_REQUEST
 
         # Process message and update state
-        bot_response = chatbot.process_message(user_message, session_id, nlp_processor)
-        current_progress = progress_tracker.update_progress(
-            session_id,
-            bot_response.get('current_state')
-        )
+        payload, snapshot = resume_services.chat_turn(services, session_id, user_message)
 
         # Save session state
-        db.save_user_session(
-            session_id=session_id,
-            data={
-                'user_data': chatbot.sessions[session_id]['user_data'],
-                'last_state': chatbot.sessions[session_id]['state'],
-                'progress': current_progress
-            }
-        )
-
-        return jsonify({
-            'response': bot_response['text'],
-            'options': bot_response.get('options', []),
-            'progress': current_progress,
-            'session_id': session_id,
-            'current_state': bot_response.get('current_state')
-        })
+        services.db.save_user_session(session_id=session_id, data=snapshot)
+        return jsonify(payload)
     except ValidationError as e:
         return handle_api_error(e, HTTPStatus.BAD_REQUEST)
     except Exception as e:
         return handle_api_error(e)
 
-@app.route('/generate-resume', methods=['POST'])
+@bp.route('/generate-resume', methods=['POST'])
+@admission_controlled('pdf')
 def generate_resume():
     """Generate resume with comprehensive ATS analysis"""
     try:
+        services = components()
         session_id = session.get('session_id')
-        template_name = request.json.get('template', config['templates'].get('default_template', 'default'))
-        session_data = db.get_user_session(session_id)
-        if not session_data or 'user_data' not in session_data:
+        template_name = request.json.get('template', current_config().default_template)
+        user_data = resume_services.load_user_data(services, session_id)
+        if user_data is None:
             return jsonify({'error': 'Session data not found'}), HTTPStatus.NOT_FOUND
 
-        user_data = UserData(**session_data['user_data'])
-        pdf_path = resume_gen.generate_resume(
-            user_data.dict(),
-            f"{template_name}.html",
-            nlp_processor
-        )
-        
-        ats_report = ats_analyzer.full_analysis(
-            pdf_path,
-            config['ats']['keywords'],
-            user_data.domain
-        )
+        resume_id = resume_services.new_resume_id()
+        rendered = resume_services.render_resume(services, user_data.dict(), template_name, resume_id)
+        ats_report = resume_services.score_resume(services, rendered['resume_text'], user_data.domain)
 
-        resume_id = db.save_resume(
+        resume_id = services.db.save_resume(
             user_data=user_data.dict(),
-            pdf_path=pdf_path,
-            analysis_data=ats_report
+            pdf_path=rendered['pdf_path'],
+            analysis_data=ats_report,
+            template=template_name,
+            content_hash=rendered['content_hash'],
+            resume_id=resume_id
         )
-
-        return jsonify({
-            'pdf_url': f'/download-resume/{resume_id}',
-            'ats_score': ats_report['score'],
-            'ats_tips': ats_report['improvement_tips'],
-            'keyword_matches': ats_report['keyword_matches'],
-            'preview': resume_gen.get_html_preview(user_data.dict())
-        })
+        return jsonify(resume_services.resume_payload(resume_id, rendered, ats_report))
     except ValidationError as e:
         return handle_api_error(e, HTTPStatus.BAD_REQUEST)
     except Exception as e:
         return handle_api_error(e)
 
-@app.route('/download-resume/<resume_id>')
+@bp.route('/download-resume/<resume_id>')
 def download_resume(resume_id: str):
     """Secure resume download endpoint"""
     try:
-        resume_data = db.get_resume(resume_id)
+        services = components()
+        resume_data = services.db.get_resume(resume_id)
         if not resume_data or not os.path.exists(resume_data['pdf_path']):
             return jsonify({'error': 'Resume not found'}), HTTPStatus.NOT_FOUND
         return send_file(
@@ -193,10 +217,12 @@ def download_resume(resume_id: str):
     except Exception as e:
         return handle_api_error(e)
 
-@app.route('/upload-photo', methods=['POST'])
+@bp.route('/upload-photo', methods=['POST'])
+@admission_controlled('upload')
 def upload_photo():
     """Secure photo upload with advanced processing"""
     try:
+        services = components()
         session_id = session.get('session_id')
         if 'photo' not in request.files:
             return jsonify({'error': 'No file uploaded'}), HTTPStatus.BAD_REQUEST
@@ -206,41 +232,92 @@ def upload_photo():
             return jsonify({'error': 'No selected file'}), HTTPStatus.BAD_REQUEST
 
         try:
-            file_path = file_uploader.secure_save_upload(file, session_id)
+            file_path = services.file_uploader.secure_save_upload(file, session_id)
         except ValueError as err:
             return jsonify({'error': str(err)}), HTTPStatus.BAD_REQUEST
 
         relative_path = f"/uploads/{os.path.basename(file_path)}"
-        db.update_user_data(session_id=session_id, update_data={'photo_url': relative_path})
+        services.db.update_user_data(session_id=session_id, update_data={'photo_url': relative_path})
         return jsonify({'photo_url': f"/static/images/{os.path.basename(file_path)}"})
     except Exception as e:
         return handle_api_error(e)
 
-@app.route('/analyze-text', methods=['POST'])
+@bp.route('/analyze-text', methods=['POST'])
+@admission_controlled(analysis_work_class)
 def analyze_text():
     """NLP analysis endpoint for real-time feedback"""
     try:
+        services = components()
         text = request.json.get('text', '')
         if not text:
             return jsonify({'error': 'No text provided'}), HTTPStatus.BAD_REQUEST
-        analysis = nlp_processor.comprehensive_analysis(text)
-        return jsonify(analysis)
+        level = request.json.get('level')
+        if level not in (None, *ANALYSIS_LEVELS):
+            return jsonify({'error': f'level must be one of {", ".join(ANALYSIS_LEVELS)}'}), HTTPStatus.BAD_REQUEST
+        return jsonify(resume_services.analyze_text(services, text, level))
     except Exception as e:
         return handle_api_error(e)
 
-@app.errorhandler(HTTPStatus.NOT_FOUND)
+@bp.route('/match-job', methods=['POST'])
+@admission_controlled('deep_nlp')
+def match_job():
+    """Score the session's resume (or supplied resume text) against a job description"""
+    try:
+        services = components()
+        jd_text = request.json.get('job_description', '').strip()
+        if not jd_text:
+            return jsonify({'error': 'No job description provided'}), HTTPStatus.BAD_REQUEST
+        resume = request.json.get('resume_text')
+        if not resume:
+            user_data = resume_services.load_user_data(services, session.get('session_id'))
+            if user_data is None:
+                return jsonify({'error': 'Session data not found'}), HTTPStatus.NOT_FOUND
+            resume = user_data.dict()
+        return jsonify(resume_services.match_job(services, resume, jd_text))
+    except ValidationError as e:
+        return handle_api_error(e, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return handle_api_error(e)
+
+@bp.route('/admin/profile', methods=['POST'])
+def admin_profile():
+    """Profile a time window across all threads, or arm the next calls of a profiled target"""
+    if not profiling.authorized(request.headers.get('X-Admin-Token')):
+        return jsonify({'error': 'Resource not found'}), HTTPStatus.NOT_FOUND
+    try:
+        payload = request.get_json(silent=True) or {}
+        if payload.get('target'):
+            profiling.arm(payload['target'], int(payload.get('count', 1)))
+            return jsonify({'armed': profiling.armed_targets(), 'output_dir': profiling.output_dir})
+        name = profiling.start_window(float(payload.get('seconds', 10)))
+        return jsonify({'profile': name, 'output_dir': profiling.output_dir}), HTTPStatus.ACCEPTED
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), HTTPStatus.BAD_REQUEST
+
+@bp.route('/admin/admission')
+def admin_admission():
+    """Admitted, queued and shed counts per work class"""
+    admission = current_app.extensions['admission']
+    if not admission.metrics_authorized(request.headers.get('X-Admin-Token')):
+        return jsonify({'error': 'Resource not found'}), HTTPStatus.NOT_FOUND
+    return jsonify(admission.metrics())
+
+@bp.app_errorhandler(HTTPStatus.NOT_FOUND)
 def handle_not_found(e):
     return jsonify({'error': 'Resource not found'}), HTTPStatus.NOT_FOUND
 
-@app.errorhandler(HTTPStatus.INTERNAL_SERVER_ERROR)
+@bp.app_errorhandler(HTTPStatus.INTERNAL_SERVER_ERROR)
 def handle_server_error(e):
     return jsonify({'error': 'Internal server error'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.errorhandler(413)
+@bp.app_errorhandler(413)
 def handle_file_size_error(e):
-    return jsonify({'error': f'File size exceeds {config["storage"]["max_file_size_bytes"] // (1024*1024)}MB'}), 413
+    max_bytes = current_config()['storage']['max_file_size_bytes']
+    return jsonify({'error': f'File size exceeds {max_bytes // (1024*1024)}MB'}), 413
 
 if __name__ == '__main__':
+    app = create_app()
+    config = app.extensions['config_store'].get()
     try:
         print("Starting Resume Builder Application...")
         print(f"Server running on http://{config['app']['host']}:{config['app']['port']}")
@@ -251,6 +328,7 @@ if __name__ == '__main__':
         print("  - GET  /download-resume/<resume_id>")
         print("  - POST /upload-photo")
         print("  - POST /analyze-text")
+        print("  - POST /match-job")
         print("\nPress CTRL+C to stop the server")
         app.run(
             host=config['app']['host'],
@@ -260,9 +338,9 @@ if __name__ == '__main__':
         )
     except KeyboardInterrupt:
         print("\nShutting down gracefully...")
-        chatbot.stop_session_cleanup_job()
+        app.extensions['components'].close()
     except Exception as e:
-        logging.critical(f"Application failed to start: {str(e)}", exc_info=True)
+        logging.critical("Application failed to start: %s", e, exc_info=True)
         raise
     finally:
-        print("Application shutdown complete.")
\ No newline at end of file
+        print("Application shutdown complete.")
@@ -0,0 +1,343 @@
+"""ASGI serving mode for the same routes as app.py.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+Cheap handlers run on the event loop; blocking Mongo calls (including the
+session reload in each chat turn) go to a thread; NLP analyses, ATS scoring and
+PDF rendering are sent to an ``OffloadPool`` of pre-warmed worker processes.
+How many of the expensive requests may be in flight is decided once, by the
+``admission`` classes, before the handler runs. A slow resume generation
+therefore never holds up ``/chat`` on the same server process."""
+import functools
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from http import HTTPStatus
+
+from pydantic import ValidationError
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+from werkzeug.datastructures import FileStorage
+
+from app import create_required_directories, resolve_secret_key
+from backend import services as resume_services
+from backend.admission import AdmissionController, Shed
+from backend.components import Components
+from backend.offload import OffloadPool, request_profile
+from utils.config import ConfigStore
+from utils.logging_setup import setup_logging
+from utils.nlp_processor import ANALYSIS_LEVELS, DEEP
+from utils.profiler import profiling
+
+CONFIG_PATH = os.environ.get('RESUME_BUILDER_CONFIG', 'config.yaml')
+
+
+def api_error(e: Exception, status_code: int = HTTPStatus.INTERNAL_SERVER_ERROR) -> JSONResponse:
+    error_message = str(e) if isinstance(e, ValidationError) else "Internal server error"
+    logging.error("API error: %s", e, exc_info=True)
+    return JSONResponse({'error': error_message}, status_code=status_code)
+
+
+def get_session_id(request: Request) -> str:
+    return request.session.get('session_id', datetime.now().strftime("%Y%m%d%H%M%S%f"))
+
+
+def shed_response(e: Shed) -> JSONResponse:
+    return JSONResponse({'error': e.reason, 'retry_after': e.retry_after}, status_code=e.status,
+                        headers={'Retry-After': str(e.retry_after)})
+
+
+def admission_controlled(work_class=None):
+    """ASGI counterpart of app.admission_controlled; ``work_class`` may be an async callable of the request"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(request: Request):
+            name = await work_class(request) if callable(work_class) else work_class
+            session_key = request.session.get('session_id') or (request.client.host if request.client else '')
+            try:
+                async with request.app.state.admission.admit_async(session_key, name):
+                    return await handler(request)
+            except Shed as e:
+                return shed_response(e)
+        return wrapper
+    return decorator
+
+
+async def analysis_work_class(request: Request):
+    try:
+        payload = await request.json()
+    except ValueError:
+        return None
+    level = payload.get('level') or request.app.state.components.config_store.get()['nlp'].get('analysis_level', DEEP)
+    return 'deep_nlp' if level == DEEP else None
+
+
+async def home(request: Request):
+    services = request.app.state.components
+    try:
+        session_id = get_session_id(request)
+        request.session['session_id'] = session_id
+        if session_id not in services.chatbot.sessions:
+            services.chatbot._initialize_session(session_id)
+        services.progress_tracker.reset_progress(session_id)
+        return templates.TemplateResponse(request, 'index.html', {'config': services.config_store.get()})
+    except Exception as e:
+        logging.critical("Session initialization failed: %s", e, exc_info=True)
+        return templates.TemplateResponse(request, 'index.html', {'config': services.config_store.get()},
+                                          status_code=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+async def handle_chat(request: Request):
+    services = request.app.state.components
+    try:
+        session_id = request.session.get('session_id')
+        user_message = (await request.json()).get('message', '').strip()
+        if not user_message:
+            return JSONResponse({'error': 'Empty message received'}, status_code=HTTPStatus.BAD_REQUEST)
+        # chat_turn reloads the saved conversation from Mongo, so it runs off the loop
+        payload, snapshot = await run_in_threadpool(resume_services.chat_turn, services, session_id, user_message)
+        await run_in_threadpool(services.db.save_user_session, session_id=session_id, data=snapshot)
+        return JSONResponse(payload)
+    except ValidationError as e:
+        return api_error(e, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return api_error(e)
+
+
+@admission_controlled('pdf')
+async def generate_resume(request: Request):
+    services = request.app.state.components
+    pool = request.app.state.pool
+    try:
+        session_id = request.session.get('session_id')
+        template_name = (await request.json()).get('template', services.config_store.get().default_template)
+        user_data = await run_in_threadpool(resume_services.load_user_data, services, session_id)
+        if user_data is None:
+            return JSONResponse({'error': 'Session data not found'}, status_code=HTTPStatus.NOT_FOUND)
+
+        resume_id = resume_services.new_resume_id()
+        rendered = await pool.run(resume_services.pool_render_resume, user_data.dict(), template_name, resume_id)
+        ats_report = await pool.run(resume_services.pool_score_resume, rendered['resume_text'], user_data.domain)
+        resume_id = await run_in_threadpool(
+            services.db.save_resume,
+            user_data=user_data.dict(),
+            pdf_path=rendered['pdf_path'],
+            analysis_data=ats_report,
+            template=template_name,
+            content_hash=rendered['content_hash'],
+            resume_id=resume_id
+        )
+        return JSONResponse(resume_services.resume_payload(resume_id, rendered, ats_report))
+    except ValidationError as e:
+        return api_error(e, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return api_error(e)
+
+
+async def download_resume(request: Request):
+    services = request.app.state.components
+    try:
+        resume_data = await run_in_threadpool(services.db.get_resume, request.path_params['resume_id'])
+        if not resume_data or not os.path.exists(resume_data['pdf_path']):
+            return JSONResponse({'error': 'Resume not found'}, status_code=HTTPStatus.NOT_FOUND)
+        return FileResponse(
+            resume_data['pdf_path'],
+            filename=f"{resume_data['user_data']['name']}_Resume.pdf",
+            media_type='application/pdf'
+        )
+    except Exception as e:
+        return api_error(e)
+
+
+@admission_controlled('upload')
+async def upload_photo(request: Request):
+    services = request.app.state.components
+    try:
+        session_id = request.session.get('session_id')
+        form = await request.form()
+        upload = form.get('photo')
+        if upload is None or isinstance(upload, str):
+            return JSONResponse({'error': 'No file uploaded'}, status_code=HTTPStatus.BAD_REQUEST)
+        if upload.filename == '':
+            return JSONResponse({'error': 'No selected file'}, status_code=HTTPStatus.BAD_REQUEST)
+
+        file = FileStorage(stream=upload.file, filename=upload.filename)
+        try:
+            file_path = await run_in_threadpool(services.file_uploader.secure_save_upload, file, session_id)
+        except ValueError as err:
+            return JSONResponse({'error': str(err)}, status_code=HTTPStatus.BAD_REQUEST)
+
+        relative_path = f"/uploads/{os.path.basename(file_path)}"
+        await run_in_threadpool(services.db.update_user_data, session_id=session_id,
+                                update_data={'photo_url': relative_path})
+        return JSONResponse({'photo_url': f"/static/images/{os.path.basename(file_path)}"})
+    except Exception as e:
+        return api_error(e)
+
+
+@admission_controlled(analysis_work_class)
+async def analyze_text(request: Request):
+    try:
+        payload = await request.json()
+        text = payload.get('text', '')
+        if not text:
+            return JSONResponse({'error': 'No text provided'}, status_code=HTTPStatus.BAD_REQUEST)
+        level = payload.get('level')
+        if level not in (None, *ANALYSIS_LEVELS):
+            return JSONResponse({'error': f'level must be one of {", ".join(ANALYSIS_LEVELS)}'},
+                                status_code=HTTPStatus.BAD_REQUEST)
+        analysis = await request.app.state.pool.run(resume_services.pool_analyze_text, text, level)
+        return JSONResponse(analysis)
+    except Exception as e:
+        return api_error(e)
+
+
+@admission_controlled('deep_nlp')
+async def match_job(request: Request):
+    services = request.app.state.components
+    try:
+        payload = await request.json()
+        jd_text = payload.get('job_description', '').strip()
+        if not jd_text:
+            return JSONResponse({'error': 'No job description provided'}, status_code=HTTPStatus.BAD_REQUEST)
+        resume = payload.get('resume_text')
+        if not resume:
+            user_data = await run_in_threadpool(resume_services.load_user_data, services, request.session.get('session_id'))
+            if user_data is None:
+                return JSONResponse({'error': 'Session data not found'}, status_code=HTTPStatus.NOT_FOUND)
+            resume = user_data.dict()
+        result = await request.app.state.pool.run(resume_services.pool_match_job, resume, jd_text)
+        return JSONResponse(result)
+    except ValidationError as e:
+        return api_error(e, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return api_error(e)
+
+
+async def admin_profile(request: Request):
+    """Profile a time window of this process, or arm the next calls of a profiled target (run in the pool)"""
+    if not profiling.authorized(request.headers.get('X-Admin-Token')):
+        return JSONResponse({'error': 'Resource not found'}, status_code=HTTPStatus.NOT_FOUND)
+    try:
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = {}
+        if payload.get('target'):
+            profiling.arm(payload['target'], int(payload.get('count', 1)))
+            return JSONResponse({'armed': profiling.armed_targets(), 'output_dir': profiling.output_dir})
+        name = profiling.start_window(float(payload.get('seconds', 10)))
+        return JSONResponse({'profile': name, 'output_dir': profiling.output_dir}, status_code=HTTPStatus.ACCEPTED)
+    except (TypeError, ValueError) as e:
+        return JSONResponse({'error': str(e)}, status_code=HTTPStatus.BAD_REQUEST)
+
+
+async def admin_admission(request: Request):
+    admission = request.app.state.admission
+    if not admission.metrics_authorized(request.headers.get('X-Admin-Token')):
+        return JSONResponse({'error': 'Resource not found'}, status_code=HTTPStatus.NOT_FOUND)
+    return JSONResponse(admission.metrics())
+
+
+class RequestProfileMiddleware:
+    """ASGI counterpart of app.py's X-Profile request hooks.
+
+    Samples the event-loop thread for the request and marks the request so its
+    offloaded tasks are sampled inside the pool worker as well."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not profiling.enabled \
+                or not profiling.authorized(Headers(scope=scope).get(profiling.header)):
+            await self.app(scope, receive, send)
+            return
+        name = f"request_{scope['path'].strip('/').replace('/', '_') or 'home'}"
+        token = request_profile.set(name)
+        profiler = profiling.start(name, thread_ids={threading.get_ident()})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_profile.reset(token)
+            await run_in_threadpool(profiling.finish, profiler)
+
+
+async def handle_not_found(request: Request, exc):
+    return JSONResponse({'error': 'Resource not found'}, status_code=HTTPStatus.NOT_FOUND)
+
+
+async def handle_server_error(request: Request, exc):
+    return JSONResponse({'error': 'Internal server error'}, status_code=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+def create_asgi_app(config_path: str = CONFIG_PATH) -> Starlette:
+    config_store = ConfigStore(config_path)
+    config = config_store.get()
+    setup_logging(config)
+    create_required_directories(config)
+    profiling.configure(config)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        app.state.pool = OffloadPool(config_path, config_store.get())
+        try:
+            await app.state.pool.warmup()
+            yield
+        finally:
+            app.state.pool.shutdown()
+            app.state.components.close()
+
+    app = Starlette(
+        routes=[
+            Route('/', home),
+            Route('/chat', handle_chat, methods=['POST']),
+            Route('/generate-resume', generate_resume, methods=['POST']),
+            Route('/download-resume/{resume_id}', download_resume),
+            Route('/upload-photo', upload_photo, methods=['POST']),
+            Route('/analyze-text', analyze_text, methods=['POST']),
+            Route('/match-job', match_job, methods=['POST']),
+            Route('/admin/profile', admin_profile, methods=['POST']),
+            Route('/admin/admission', admin_admission),
+            Mount('/static', StaticFiles(directory='static'), name='static'),
+        ],
+        middleware=[
+            Middleware(
+                SessionMiddleware,
+                secret_key=resolve_secret_key(config),
+                max_age=config['app'].get('session_lifetime', 3600)
+            ),
+            Middleware(RequestProfileMiddleware),
+        ],
+        exception_handlers={
+            HTTPStatus.NOT_FOUND: handle_not_found,
+            HTTPStatus.INTERNAL_SERVER_ERROR: handle_server_error,
+        },
+        lifespan=lifespan,
+    )
+    # Chat and session state stay in this process; the heavy models live only in the pool
+    app.state.components = Components(config_store)
+    app.state.admission = AdmissionController(config)
+    return app
+
+
+templates = Jinja2Templates(directory='templates')
+# The templates use Flask's url_for('static', filename=...) signature
+templates.env.globals['url_for'] = lambda endpoint, filename='': f"/{endpoint}/{filename}"
+
+def __getattr__(name: str):
+    # ``uvicorn asgi:app`` builds the app on first access, so importing this module has no side effects
+    if name == 'app':
+        globals()['app'] = create_asgi_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,273 @@
+"""Admission control for the expensive endpoints.
+
+Every admission-controlled request first takes a token from its session's bucket
+(one user can't monopolise the server) and then a slot in its work class (PDF
+rendering, deep NLP, upload processing). A request that finds its class full
+waits up to the class's ``queue_timeout`` for a slot; if none frees up in time, or
+too many requests are already waiting, it is shed. Shed requests get 429 (session
+over its rate) or 503 (class saturated) with a ``Retry-After`` hint, so cheap
+endpoints such as ``/chat`` keep their latency under load.
+
+Limits come from the ``admission`` section of config.yaml and are read at start-up.
+
+Scope: the limits are global to a server, not per process. Slots, session buckets
+and counters live in ``multiprocessing`` shared memory, so the controller must be
+built before the workers fork. ``create_app`` does this in the gunicorn master
+(``preload_app``), which makes the limits hold across sync workers. Built in each
+worker instead (no preload), every worker would get its own limits. The ASGI app
+is one process and takes its slots with asyncio semaphores, so the event loop is
+never blocked. Its CPU-bound work then runs in the offload pool, and these
+classes are the only bound on how much of it is in flight.
+
+A worker that is SIGKILLed (gunicorn timeout, OOM killer) never runs the
+``finally`` that gives its slot back. Each held slot and queue place is therefore
+recorded against the holder's pid, and the master's ``child_exit`` hook
+(gunicorn.conf.py) calls ``AdmissionController.reclaim`` with the dead pid.
+"""
+import asyncio
+import hmac
+import math
+import multiprocessing
+import os
+from contextlib import asynccontextmanager, contextmanager
+from http import HTTPStatus
+from typing import Dict, Optional, Sequence
+
+from utils.config import Settings
+from utils.rate_limit import SharedTokenBuckets
+
+DEFAULT_CLASSES = {
+    "pdf": {"concurrency": 2, "queue_timeout": 2.0, "max_queue": 8},
+    "deep_nlp": {"concurrency": 4, "queue_timeout": 1.0, "max_queue": 16},
+    "upload": {"concurrency": 4, "queue_timeout": 2.0, "max_queue": 16},
+}
+
+
+class Shed(Exception):
+    """Raised instead of admitting a request; carries the HTTP status and Retry-After seconds."""
+
+    def __init__(self, status: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+COUNTERS = ("admitted", "queued", "shed")
+IN_FLIGHT, WAITING = len(COUNTERS), len(COUNTERS) + 1
+
+
+class WorkClass:
+    """Bounded concurrency for one kind of work, usable from threads, forked workers or an event loop."""
+
+    def __init__(self, name: str, concurrency: int, queue_timeout: float, max_queue: int,
+                 retry_after: Optional[float] = None):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.retry_after = max(1, math.ceil(retry_after if retry_after is not None else queue_timeout))
+        self._slots = multiprocessing.BoundedSemaphore(concurrency)
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._lock = multiprocessing.Lock()
+        # admitted, queued, shed, in_flight, waiting; shared by every worker
+        self._counts = multiprocessing.RawArray("q", len(COUNTERS) + 2)
+        # pid per held slot / queue place (0 = free), so a dead worker's share can be reclaimed
+        self._holders = multiprocessing.RawArray("q", concurrency)
+        self._waiters = multiprocessing.RawArray("q", max_queue)
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: self._counts[i] for i, name in enumerate(COUNTERS)}
+
+    def _count(self, counter: str, in_flight: int = 0) -> None:
+        with self._lock:
+            if counter:
+                self._counts[COUNTERS.index(counter)] += 1
+            self._counts[IN_FLIGHT] += in_flight
+
+    def _shed(self, reason: str) -> Shed:
+        self._count("shed")
+        return Shed(HTTPStatus.SERVICE_UNAVAILABLE, self.retry_after, reason)
+
+    @staticmethod
+    def _swap(table: Sequence[int], old: int, new: int) -> None:
+        """Replace the first ``old`` entry of a pid table; caller holds ``_lock``"""
+        for i, pid in enumerate(table):
+            if pid == old:
+                table[i] = new
+                return
+
+    def _enter_queue(self) -> None:
+        with self._lock:
+            if self._counts[WAITING] >= self.max_queue:
+                self._counts[COUNTERS.index("shed")] += 1
+                raise Shed(HTTPStatus.SERVICE_UNAVAILABLE, self.retry_after, f"{self.name} queue is full")
+            self._counts[WAITING] += 1
+            self._swap(self._waiters, 0, os.getpid())
+
+    def _leave_queue(self) -> None:
+        with self._lock:
+            self._counts[WAITING] -= 1
+            self._swap(self._waiters, os.getpid(), 0)
+
+    def _hold(self, counter: str, pid: int) -> None:
+        with self._lock:
+            self._counts[COUNTERS.index(counter)] += 1
+            self._counts[IN_FLIGHT] += 1
+            self._swap(self._holders, 0, pid)
+
+    def _release(self, pid: int) -> None:
+        with self._lock:
+            self._counts[IN_FLIGHT] -= 1
+            self._swap(self._holders, pid, 0)
+        self._slots.release()
+
+    @contextmanager
+    def slot(self):
+        pid = os.getpid()
+        if self._slots.acquire(False):
+            self._hold("admitted", pid)
+        else:
+            self._enter_queue()
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+            self._leave_queue()
+            if not acquired:
+                raise self._shed(f"{self.name} is at capacity")
+            self._hold("queued", pid)
+        try:
+            yield
+        finally:
+            self._release(pid)
+
+    def reclaim(self, pid: int) -> int:
+        """Give back the slots and queue places a dead process still holds; returns the slots freed"""
+        with self._lock:
+            held = [i for i, holder in enumerate(self._holders) if holder == pid]
+            for i in held:
+                self._holders[i] = 0
+            self._counts[IN_FLIGHT] -= len(held)
+            for i, waiter in enumerate(self._waiters):
+                if waiter == pid:
+                    self._waiters[i] = 0
+                    self._counts[WAITING] -= 1
+        for _ in held:
+            self._slots.release()
+        return len(held)
+
+    @asynccontextmanager
+    async def async_slot(self):
+        if self._async_slots is None:
+            # Created inside the running loop; asyncio primitives must not outlive it
+            self._async_slots = asyncio.Semaphore(self.concurrency)
+        slots = self._async_slots
+        if not slots.locked():
+            await slots.acquire()
+            self._count("admitted", in_flight=1)
+        else:
+            self._enter_queue()
+            try:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._shed(f"{self.name} is at capacity")
+            finally:
+                self._leave_queue()
+            self._count("queued", in_flight=1)
+        try:
+            yield
+        finally:
+            self._count("", in_flight=-1)
+            slots.release()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+        return {**dict(zip(COUNTERS, counts)), "in_flight": counts[IN_FLIGHT], "waiting": counts[WAITING],
+                "concurrency": self.concurrency}
+
+
+class AdmissionController:
+    """Per-session token buckets plus one ``WorkClass`` per kind of expensive work."""
+
+    def __init__(self, settings: Settings):
+        admission = settings.get("admission", {})
+        self.enabled = bool(admission.get("enabled", True))
+        session_rate = admission.get("session_rate", {})
+        self.session_rate = float(session_rate.get("rate_per_second", 1.0))
+        self.session_burst = float(session_rate.get("burst", 5))
+        self.max_sessions = int(admission.get("max_sessions", 10000))
+        self._buckets = SharedTokenBuckets(self.session_rate, self.session_burst, slots=self.max_sessions)
+        self._lock = multiprocessing.Lock()
+        self._session_counts = multiprocessing.RawArray("q", 2)  # admitted, shed
+        self._metrics_token = str(admission.get("metrics_token", "") or "")
+
+        classes = {name: dict(limits) for name, limits in DEFAULT_CLASSES.items()}
+        for name, limits in admission.get("classes", {}).items():
+            classes[name] = {**classes.get(name, {}), **dict(limits)}
+        self.classes = {
+            name: WorkClass(
+                name,
+                concurrency=int(limits["concurrency"]),
+                queue_timeout=float(limits.get("queue_timeout", 1.0)),
+                max_queue=int(limits.get("max_queue", limits["concurrency"] * 4)),
+                retry_after=limits.get("retry_after")
+            )
+            for name, limits in classes.items()
+        }
+
+    def check_session(self, session_key: str) -> None:
+        """Take one token from the session's bucket or raise ``Shed`` (429)."""
+        admitted = self._buckets.try_acquire(session_key)
+        with self._lock:
+            self._session_counts[0 if admitted else 1] += 1
+        if not admitted:
+            raise Shed(HTTPStatus.TOO_MANY_REQUESTS, max(1, math.ceil(self._buckets.wait_time(session_key))),
+                       "Too many requests for this session")
+
+    @contextmanager
+    def admit(self, session_key: str, work_class: Optional[str] = None):
+        """Hold admission for the duration of a synchronous request"""
+        if not self.enabled:
+            yield
+            return
+        self.check_session(session_key)
+        if work_class is None:
+            yield
+            return
+        with self.classes[work_class].slot():
+            yield
+
+    @asynccontextmanager
+    async def admit_async(self, session_key: str, work_class: Optional[str] = None):
+        """Same as ``admit`` for ASGI handlers; waiting never blocks the event loop"""
+        if not self.enabled:
+            yield
+            return
+        self.check_session(session_key)
+        if work_class is None:
+            yield
+            return
+        async with self.classes[work_class].async_slot():
+            yield
+
+    def reclaim(self, pid: int) -> Dict[str, int]:
+        """Slots freed per work class after worker ``pid`` died without releasing them"""
+        freed = {name: work_class.reclaim(pid) for name, work_class in self.classes.items()}
+        return {name: count for name, count in freed.items() if count}
+
+    def metrics_authorized(self, token: Optional[str]) -> bool:
+        """The metrics endpoint is only reachable with a non-empty, matching token"""
+        if not self._metrics_token or not token:
+            return False
+        return hmac.compare_digest(token, self._metrics_token)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            admitted, shed = self._session_counts
+        session = {"admitted": admitted, "shed": shed, "tracked": self._buckets.tracked()}
+        return {
+            "enabled": self.enabled,
+            "session": session,
+            "classes": {name: work_class.snapshot() for name, work_class in self.classes.items()},
+        }
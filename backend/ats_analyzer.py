@@ -1,29 +1,44 @@
 import re
-from typing import Dict
-import spacy
-import yaml
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from backend.jd_matcher import JobDescriptionMatcher
 from data_models.user_model import UserData
+from utils.config import ConfigStore, Settings, get_config_store
+
+ResumeInput = Union[str, Dict]
 
 class ATSAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        with open("config.yaml") as f:
-            self.config = yaml.safe_load(f)
-
-    def calculate_score(self, resume_text: str) -> Dict:
-        score = 0
-        max_score = len(self.config["ats"]["keywords"])
+    def __init__(self, config_store: Optional[ConfigStore] = None, nlp_processor=None):
+        self.config_store = config_store or get_config_store()
+        self.nlp_processor = nlp_processor
+        # (ats.keywords it was built for, matcher); rebuilt after a keywords hot reload
+        self._jd_matcher: Optional[Tuple[Tuple[str, ...], JobDescriptionMatcher]] = None
+        self._jd_lock = threading.Lock()
+
+    @property
+    def config(self) -> Settings:
+        return self.config_store.get()
+
+    def calculate_score(self, resume_text: str, keywords: Optional[Sequence[str]] = None) -> Dict:
+        config = self.config
+        if keywords is None or tuple(keywords) == config.ats_keywords:
+            keywords, keywords_lower = config.ats_keywords, config.ats_keywords_lower
+        else:
+            keywords_lower = [kw.lower() for kw in keywords]
+        max_score = len(keywords)
+        text_lower = resume_text.lower()
         
         # Keyword matching
         keyword_matches = [
-            kw for kw in self.config["ats"]["keywords"]
-            if kw.lower() in resume_text.lower()
+            kw for kw, kw_lower in zip(keywords, keywords_lower)
+            if kw_lower in text_lower
         ]
         
         # Section completeness
         sections_found = [
-            section for section in self.config["ats"]["required_sections"]
-            if re.search(rf"\b{section}\b", resume_text, re.IGNORECASE)
+            section for section, pattern in config.section_patterns
+            if pattern.search(resume_text)
         ]
         
         # Formatting checks
@@ -33,14 +48,124 @@ class ATSAnalyzer:
         return {
             "score": len(keyword_matches),
             "max_score": max_score,
-            "keywords_missing": list(set(self.config["ats"]["keywords"]) - set(keyword_matches)),
-            "sections_missing": list(set(self.config["ats"]["required_sections"]) - set(sections_found)),
+            "keyword_matches": keyword_matches,
+            "keywords_missing": list(set(keywords) - set(keyword_matches)),
+            "sections_missing": list(set(config.required_sections) - set(sections_found)),
             "formatting": {
                 "has_bullet_points": has_bullet_points,
                 "has_dates": has_dates
             }
         }
 
+    def full_analysis(self, resume_text: str, keywords: Optional[Sequence[str]] = None,
+                      domain: Optional[str] = None) -> Dict:
+        """Score plus improvement tips, as returned to the client after generation"""
+        analysis = self.calculate_score(resume_text, keywords)
+        analysis["improvement_tips"] = self.generate_improvement_tips(analysis)
+        analysis["domain"] = domain
+        return analysis
+
+    @property
+    def jd_matcher(self) -> JobDescriptionMatcher:
+        """Embedding matrix over taxonomy skill names and the current ATS keywords, built on first use"""
+        keywords = self.config.ats_keywords
+        cached = self._jd_matcher
+        if cached is None or cached[0] != keywords:
+            with self._jd_lock:
+                cached = self._jd_matcher
+                if cached is None or cached[0] != keywords:
+                    if self.nlp_processor is None:
+                        raise RuntimeError("Job description matching needs an NLPProcessor")
+                    taxonomy = self.nlp_processor.skill_taxonomy
+                    vocabulary = [taxonomy.skill(i)[1] for i in range(taxonomy.skill_count)]
+                    vocabulary.extend(keywords)
+                    cached = self._jd_matcher = (keywords, JobDescriptionMatcher(self.nlp_processor.embed, vocabulary))
+        return cached[1]
+
+    def job_phrases(self, jd_text: str) -> Tuple[List[str], List[float]]:
+        """Requirements mentioned in a JD, weighted by mention count.
+
+        Taxonomy skills and ATS keywords first, then the technology names the
+        vocabulary doesn't know (``NLPProcessor.candidate_terms``); the matcher embeds
+        those on the fly."""
+        counts: Counter = Counter()
+        tokens = self.nlp_processor.tokenize(jd_text)
+        for match in self.nlp_processor.skill_taxonomy.match_tokens(tokens, self.nlp_processor.skill_threshold):
+            counts[match.name] += 1
+        jd_lower = jd_text.lower()
+        seen = {name.lower() for name in counts}
+        for kw, kw_lower in zip(self.config.ats_keywords, self.config.ats_keywords_lower):
+            mentions = jd_lower.count(kw_lower) if kw_lower not in seen else 0
+            if mentions:
+                counts[kw] += mentions
+        seen.update(kw.lower() for kw in counts)
+        for term in self.nlp_processor.candidate_terms(jd_text):
+            if term.lower() not in seen:
+                counts[term] += 1
+        phrases = list(counts)
+        return phrases, [float(counts[phrase]) for phrase in phrases]
+
+    def resume_units(self, resume: ResumeInput) -> List[Tuple[str, str]]:
+        """(section, text) pairs: lines of plain text, or the fields of a UserData dict"""
+        if isinstance(resume, dict):
+            user = UserData(**resume)
+            units = [("Skills", skill) for skill in user.skills if skill]
+            units += [("Experience", f"{exp.job_title}. {exp.description}") for exp in user.experiences]
+            units += [("Education", f"{edu.degree}, {edu.institution}") for edu in user.education]
+            units += [("Certifications", cert) for cert in user.certifications if cert]
+            return units
+
+        units, section = [], "General"
+        for line in resume.splitlines():
+            line = line.strip(" \t•-*")
+            if len(line) < 3:
+                continue
+            heading = len(line.split()) <= 4 and next(
+                (name for name, pattern in self.config.section_patterns if pattern.search(line)), None)
+            if heading:
+                section = heading
+            elif section == "Skills":
+                # Skill lists are comma separated; averaging a whole list would blur every item
+                units.extend((section, item.strip()) for item in re.split(r"[,;|]", line) if item.strip())
+            else:
+                units.append((section, line))
+        return units
+
+    def match_job_description(self, resume: ResumeInput, jd_text: str) -> Dict:
+        """Similarity score of one resume against one JD, with ranked gaps.
+
+        ``score`` is None (and ``no_recognized_requirements`` True) when nothing in
+        the JD reads as a requirement, rather than a misleading 0."""
+        jd_settings = self.config["ats"].get("jd_matching", {})
+        phrases, weights = self.job_phrases(jd_text)
+        if not phrases:
+            return {"score": None, "coverage": [], "gaps": [], "job_phrases": [],
+                    "no_recognized_requirements": True}
+        result = self.jd_matcher.match(
+            phrases, self.resume_units(resume), weights,
+            gap_threshold=jd_settings.get("gap_threshold", 0.65),
+            max_gaps=jd_settings.get("max_gaps", 10)
+        )
+        result["job_phrases"] = phrases
+        result["no_recognized_requirements"] = False
+        return result
+
+    def score_against_jobs(self, resume: ResumeInput, jd_texts: Sequence[str]) -> List[Optional[float]]:
+        """One resume, many JDs; scores in JD order (None for a JD with no recognized requirements)"""
+        units = [text for _, text in self.resume_units(resume)]
+        extracted = [self.job_phrases(jd_text) for jd_text in jd_texts]
+        scores = self.jd_matcher.score_jobs(units, [p for p, _ in extracted], [w for _, w in extracted])
+        return [round(float(score), 1) if phrases else None for score, (phrases, _) in zip(scores, extracted)]
+
+    def rank_resumes_for_job(self, resumes: Sequence[ResumeInput], jd_text: str) -> List[Optional[float]]:
+        """Many resumes, one JD; scores in resume order (all None if the JD has no recognized requirements)"""
+        phrases, weights = self.job_phrases(jd_text)
+        if not phrases:
+            return [None] * len(resumes)
+        units = [[text for _, text in self.resume_units(resume)] for resume in resumes]
+        scores = self.jd_matcher.score_resumes(phrases, units, weights)
+        return [round(float(score), 1) for score in scores]
+
     def generate_improvement_tips(self, analysis: Dict) -> list:
         tips = []
         if analysis["keywords_missing"]:
@@ -1,21 +1,24 @@
 import os
-import yaml
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import threading
 import time
 from pydantic import ValidationError
 from data_models.user_model import UserData, ChatResponse
+from utils.config import ConfigStore, Settings, get_config_store
 
 class Chatbot:
-    def __init__(self):
-        # Load configuration from config.yaml
-        with open("config.yaml") as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_store: Optional[ConfigStore] = None):
+        self.config_store = config_store or get_config_store()
         self.sessions: Dict[str, Dict[str, Any]] = {}
         self.cleanup_thread = None
         self.running = False
 
+    @property
+    def config(self) -> Settings:
+        """Current configuration snapshot (picks up hot reloads)"""
+        return self.config_store.get()
+
     def _initialize_session(self, session_id: str) -> None:
         """Initialize a new session with default user data"""
         default_user = UserData(
@@ -36,6 +39,14 @@ class Chatbot:
             "last_interaction": datetime.now()
         }
 
+    def restore_session(self, session_id: str, state: str, user_data: Dict) -> None:
+        """Load a conversation saved by any worker (see ``services.chat_turn``)"""
+        self.sessions[session_id] = {
+            "state": state,
+            "user_data": user_data,
+            "last_interaction": datetime.now()
+        }
+
     def process_message(self, message: str, session_id: str, nlp_processor=None) -> Dict:
         if session_id not in self.sessions:
             self._initialize_session(session_id)
@@ -68,22 +79,23 @@ class Chatbot:
             session["state"] = "domain"
             return {
                 "text": "Welcome to AI Resume Builder! What's your domain of expertise?",
-                "options": self.config["chatbot"].get("domains", []),
+                "options": list(self.config.domains),
             }
         return {"text": "Please greet with 'Hi' to start the conversation."}
 
     def _handle_domain(self, message: str, session: Dict) -> Dict:
-        domains = self.config["chatbot"].get("domains", [])
-        if message.lower() in [d.lower() for d in domains]:
-            session["user_data"]["domain"] = message
+        config = self.config
+        domain = config.domain_lookup.get(message.strip().lower())
+        if domain:
+            session["user_data"]["domain"] = domain
             session["state"] = "experience"
             return {
                 "text": f"Great choice! How many years of experience do you have?",
-                "options": self.config["chatbot"].get("experience_levels", []),
+                "options": list(config.experience_levels),
             }
         return {
             "text": "Please select a valid domain.",
-            "options": domains
+            "options": list(config.domains)
         }
 
     def start_session_cleanup_job(self):
@@ -0,0 +1,121 @@
+import gc
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from utils.config import ConfigStore
+
+# Read-only after construction: safe to build once in a pre-fork master and share
+SHARED_COMPONENTS = ("nlp_processor", "ats_analyzer", "resume_gen")
+# Hold sockets, threads or per-user state: always built inside the worker
+PER_WORKER_COMPONENTS = ("db", "chatbot", "progress_tracker", "file_uploader")
+
+
+class Components:
+    """Lazily constructed application services.
+
+    Nothing heavy is built at import or ``create_app()`` time. ``warmup()`` builds
+    the shared read-only services (spaCy models, templates) up front so a pre-fork
+    server can load them once in the master; per-worker services such as the Mongo
+    client are created on first use inside each worker."""
+
+    def __init__(self, config_store: ConfigStore):
+        self.config_store = config_store
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._fork_hook_registered = False
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = factory()
+                    self._instances[name] = instance
+                    logging.info("Initialized %s in %.3fs", name, time.perf_counter() - started)
+        return instance
+
+    @property
+    def nlp_processor(self):
+        from utils.nlp_processor import NLPProcessor
+        return self._get("nlp_processor", lambda: NLPProcessor(config_store=self.config_store))
+
+    @property
+    def ats_analyzer(self):
+        from backend.ats_analyzer import ATSAnalyzer
+        return self._get("ats_analyzer", lambda: ATSAnalyzer(self.config_store, self.nlp_processor))
+
+    @property
+    def resume_gen(self):
+        from backend.resume_generator import ResumeGenerator
+        return self._get("resume_gen", lambda: ResumeGenerator(self.config_store))
+
+    @property
+    def db(self):
+        from backend.database import Database
+        return self._get("db", lambda: Database(self.config_store))
+
+    @property
+    def chatbot(self):
+        from backend.chatbot_engine import Chatbot
+        return self._get("chatbot", lambda: Chatbot(self.config_store))
+
+    @property
+    def progress_tracker(self):
+        from utils.progress_tracker import ProgressTracker
+        return self._get("progress_tracker", ProgressTracker)
+
+    @property
+    def file_uploader(self):
+        from utils.file_upload import FileUploader
+
+        def build():
+            config = self.config_store.get()
+            return FileUploader(
+                upload_folder=config['storage']['image_upload_dir'],
+                allowed_extensions=config.allowed_extensions,
+                max_size_mb=config['storage']['max_file_size_bytes'] // (1024 * 1024)
+            )
+        return self._get("file_uploader", build)
+
+    def warmup(self, freeze: bool = True) -> None:
+        """Build shared read-only services now and prepare for forking.
+
+        ``gc.freeze()`` moves everything allocated so far into the permanent
+        generation so the collector in forked children never touches (and
+        therefore never copies) those pages."""
+        started = time.perf_counter()
+        for name in SHARED_COMPONENTS:
+            getattr(self, name)
+        from utils.nlp_processor import DEEP
+        if self._instances["nlp_processor"].analysis_level == DEEP:
+            # The model is already loaded, so precompute the JD vocabulary matrix before forking
+            self._instances["ats_analyzer"].jd_matcher
+        resume_gen = self._instances["resume_gen"]
+        for template in self.config_store.get().available_templates:
+            resume_gen.env.get_template(f"{template}.html")
+        if not self._fork_hook_registered and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self.after_fork)
+            self._fork_hook_registered = True
+        if freeze:
+            gc.collect()
+            gc.freeze()
+        logging.info("Warmup finished in %.3fs", time.perf_counter() - started)
+
+    def after_fork(self) -> None:
+        """Drop per-worker services inherited from the parent; they are rebuilt lazily."""
+        self._lock = threading.RLock()
+        for name in PER_WORKER_COMPONENTS:
+            self._instances.pop(name, None)
+
+    def close(self) -> None:
+        chatbot = self._instances.get("chatbot")
+        if chatbot is not None:
+            chatbot.stop_session_cleanup_job()
+        db = self._instances.get("db")
+        if db is not None:
+            db.client.close()
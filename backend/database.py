@@ -1,13 +1,16 @@
+import logging
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
 from typing import Dict, Optional
-import yaml
 from data_models.user_model import UserData
+from utils.config import ConfigStore, get_config_store
 
 class Database:
-    def __init__(self):
-        with open("config.yaml") as f:
-            config = yaml.safe_load(f)
+    def __init__(self, config_store: Optional[ConfigStore] = None):
+        config = (config_store or get_config_store()).get()
         
         self.client = MongoClient(config["database"]["uri"])
         self.db = self.client[config["database"]["name"]]
@@ -26,7 +29,7 @@ class Database:
             )
             return True
         except PyMongoError as e:
-            print(f"Database error: {str(e)}")
+            logging.error("Database error: %s", e)
             return False
 
     def get_user_session(self, session_id: str) -> Optional[Dict]:
@@ -36,14 +39,42 @@ class Database:
         except PyMongoError:
             return None
 
-    def save_resume(self, user_data: Dict, pdf_path: str) -> str:
+    def update_user_data(self, session_id: str, update_data: Dict) -> bool:
         try:
-            result = self.resumes.insert_one({
-                "user_data": user_data,
-                "pdf_path": pdf_path,
-                "created_at": datetime.now()
-            })
+            self.users.update_one(
+                {"session_id": session_id},
+                {"$set": {
+                    **{f"data.user_data.{key}": value for key, value in update_data.items()},
+                    "last_modified": datetime.now()
+                }}
+            )
+            return True
+        except PyMongoError as e:
+            logging.error("Database error: %s", e)
+            return False
+
+    def save_resume(self, user_data: Dict, pdf_path: str, analysis_data: Optional[Dict] = None,
+                    template: Optional[str] = None, content_hash: Optional[str] = None,
+                    resume_id: Optional[str] = None) -> str:
+        document = {
+            "user_data": user_data,
+            "pdf_path": pdf_path,
+            "analysis": analysis_data,
+            "template": template,
+            "content_hash": content_hash,
+            "created_at": datetime.now()
+        }
+        if resume_id:
+            document["_id"] = ObjectId(resume_id)
+        try:
+            result = self.resumes.insert_one(document)
             return str(result.inserted_id)
         except PyMongoError as e:
-            print(f"Resume save failed: {str(e)}")
-            return ""
\ No newline at end of file
+            logging.error("Resume save failed: %s", e)
+            return ""
+
+    def get_resume(self, resume_id: str) -> Optional[Dict]:
+        try:
+            return self.resumes.find_one({"_id": ObjectId(resume_id)})
+        except (InvalidId, PyMongoError):
+            return None
\ No newline at end of file
@@ -0,0 +1,134 @@
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+class PhraseGap(NamedTuple):
+    phrase: str
+    similarity: float
+    importance: float
+    closest_section: Optional[str]
+    closest_text: Optional[str]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so a dot product is a cosine similarity; zero rows stay zero."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _segment_offsets(lengths: Sequence[int]) -> np.ndarray:
+    return np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.intp)
+
+
+class JobDescriptionMatcher:
+    """Cosine similarity between job-description phrases and resume text units.
+
+    ``vocabulary`` (skill names and ATS keywords) is embedded once into a
+    normalized matrix, so JD phrases from the vocabulary cost a row lookup instead
+    of an embedding call. All scoring is matrix products: every JD phrase against
+    every resume unit in one ``@``, with per-JD or per-resume aggregation done by
+    ``reduceat`` over stacked segments rather than Python loops."""
+
+    def __init__(self, embed: Embedder, vocabulary: Sequence[str]):
+        self.embed = embed
+        self.vocabulary = tuple(dict.fromkeys(vocabulary))
+        self._index = {phrase.lower(): row for row, phrase in enumerate(self.vocabulary)}
+        self.matrix = normalize_rows(embed(self.vocabulary)) if self.vocabulary else None
+
+    def phrase_vectors(self, phrases: Sequence[str]) -> np.ndarray:
+        rows = [self._index.get(phrase.lower()) for phrase in phrases]
+        unknown = [phrase for phrase, row in zip(phrases, rows) if row is None]
+        unknown_vectors = iter(normalize_rows(self.embed(unknown))) if unknown else iter(())
+        return np.stack([
+            self.matrix[row] if row is not None else next(unknown_vectors)
+            for row in rows
+        ]) if phrases else np.zeros((0, self._dimensions()), dtype=np.float32)
+
+    def unit_vectors(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimensions()), dtype=np.float32)
+        return normalize_rows(self.embed(texts))
+
+    def _dimensions(self) -> int:
+        if self.matrix is not None:
+            return self.matrix.shape[1]
+        return self.embed(["a"]).shape[1]
+
+    @staticmethod
+    def _weights(phrases: Sequence[str], weights: Optional[Sequence[float]]) -> np.ndarray:
+        if weights is None:
+            return np.ones(len(phrases), dtype=np.float32)
+        return np.asarray(weights, dtype=np.float32)
+
+    def match(self, jd_phrases: Sequence[str], units: Sequence[Tuple[str, str]],
+              weights: Optional[Sequence[float]] = None, gap_threshold: float = 0.65,
+              max_gaps: int = 10) -> Dict:
+        """Score one resume (``units`` = (section, text) pairs) against one JD.
+
+        Returns the weighted mean best-match similarity as a 0-100 score, per-phrase
+        coverage, and the phrases below ``gap_threshold`` ranked by
+        importance * (1 - similarity)."""
+        weight_vector = self._weights(jd_phrases, weights)
+        if not jd_phrases:
+            return {"score": 0.0, "coverage": [], "gaps": []}
+        phrase_matrix = self.phrase_vectors(jd_phrases)
+        unit_matrix = self.unit_vectors([text for _, text in units])
+        if len(unit_matrix):
+            similarities = phrase_matrix @ unit_matrix.T
+            best_unit = similarities.argmax(axis=1)
+            best = similarities[np.arange(len(jd_phrases)), best_unit]
+        else:
+            best_unit = np.full(len(jd_phrases), -1)
+            best = np.zeros(len(jd_phrases), dtype=np.float32)
+        best = np.clip(best, 0.0, 1.0)
+
+        coverage = [
+            PhraseGap(
+                phrase, float(best[i]), float(weight_vector[i]),
+                units[best_unit[i]][0] if best_unit[i] >= 0 else None,
+                units[best_unit[i]][1] if best_unit[i] >= 0 else None,
+            )
+            for i, phrase in enumerate(jd_phrases)
+        ]
+        shortfall = weight_vector * (1.0 - best)
+        gaps = [coverage[i] for i in np.argsort(-shortfall, kind="stable") if best[i] < gap_threshold]
+        return {
+            "score": round(float(100 * (weight_vector @ best) / weight_vector.sum()), 1),
+            "coverage": [gap._asdict() for gap in coverage],
+            "gaps": [gap._asdict() for gap in gaps[:max_gaps]],
+        }
+
+    def score_jobs(self, units: Sequence[str], jobs: Sequence[Sequence[str]],
+                   job_weights: Optional[Sequence[Sequence[float]]] = None) -> np.ndarray:
+        """One resume against many JDs: a single (all JD phrases x resume units) product."""
+        scores = np.zeros(len(jobs), dtype=np.float32)
+        non_empty = [i for i, phrases in enumerate(jobs) if phrases]
+        if not non_empty or not units:
+            return scores
+        phrases = [phrase for i in non_empty for phrase in jobs[i]]
+        weights = np.concatenate([
+            self._weights(jobs[i], job_weights[i] if job_weights else None) for i in non_empty
+        ])
+        best = np.clip((self.phrase_vectors(phrases) @ self.unit_vectors(units).T).max(axis=1), 0.0, 1.0)
+        offsets = _segment_offsets([len(jobs[i]) for i in non_empty])
+        scores[non_empty] = 100 * np.add.reduceat(weights * best, offsets) / np.add.reduceat(weights, offsets)
+        return scores
+
+    def score_resumes(self, jd_phrases: Sequence[str], resumes: Sequence[Sequence[str]],
+                      weights: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Many resumes against one JD: a single (JD phrases x all resume units) product."""
+        scores = np.zeros(len(resumes), dtype=np.float32)
+        non_empty = [i for i, units in enumerate(resumes) if units]
+        if not non_empty or not jd_phrases:
+            return scores
+        weight_vector = self._weights(jd_phrases, weights)
+        units = [text for i in non_empty for text in resumes[i]]
+        similarities = self.phrase_vectors(jd_phrases) @ self.unit_vectors(units).T
+        offsets = _segment_offsets([len(resumes[i]) for i in non_empty])
+        best = np.clip(np.maximum.reduceat(similarities, offsets, axis=1), 0.0, 1.0)
+        scores[non_empty] = 100 * (weight_vector @ best) / weight_vector.sum()
+        return scores
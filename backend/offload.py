@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from backend import services
+from utils.config import Settings
+from utils.profiler import profiling
+
+# Name of the X-Profile request profile in progress, set by asgi.RequestProfileMiddleware
+request_profile: ContextVar[Optional[str]] = ContextVar("request_profile", default=None)
+
+
+class OffloadPool:
+    """Process pool for CPU-bound work.
+
+    Each worker process loads its own spaCy models and templates once (see
+    ``services.pool_init``), so tasks pay no model start-up cost. The pool does
+    no limiting of its own: the ``admission`` work classes (backend/admission.py)
+    bound how many PDF renders or deep analyses are in flight before a handler
+    ever submits one, and ``process_pool_size`` bounds how many run at once.
+
+    A worker that dies (OOM kill, a crash inside spaCy or wkhtmltopdf) breaks
+    the whole ``ProcessPoolExecutor``; the pool is then replaced and the task
+    retried once, so one crash doesn't fail every later request."""
+
+    def __init__(self, config_path: str, settings: Settings):
+        async_settings = settings.get("serving", {}).get("async", {})
+        self.config_path = config_path
+        self.size = int(async_settings.get("process_pool_size", 2))
+        self.start_method = async_settings.get("start_method", "spawn")
+        self._lock = threading.Lock()
+        self.executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=services.pool_init,
+            initargs=(self.config_path,)
+        )
+
+    def _replace(self, broken: Executor) -> None:
+        # Requests that failed on the same broken pool must not each start a new one
+        with self._lock:
+            if self.executor is broken:
+                logging.error("Offload pool worker died; starting a new pool")
+                self.executor = self._new_executor()
+                broken.shutdown(wait=False, cancel_futures=True)
+
+    async def warmup(self) -> None:
+        """Start every worker now so the first real request doesn't pay for model loading."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self.executor, services.pool_ping) for _ in range(self.size)
+        ))
+        logging.info("Offload pool ready with %d workers", self.size)
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        executor = self.executor
+        try:
+            return await self._run_on(executor, func, *args)
+        except BrokenProcessPool:
+            self._replace(executor)
+            return await self._run_on(self.executor, func, *args)
+
+    async def _run_on(self, executor: Executor, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        profile = request_profile.get()
+        if profile is None and not profiling.armed_targets():
+            return await loop.run_in_executor(executor, func, *args)
+        # The @profiled targets run in the worker, so the armed counts travel with the task
+        armed = profiling.take_all()
+        try:
+            result, leftover = await loop.run_in_executor(
+                executor, services.pool_call, profile, armed, func, *args
+            )
+        except BrokenProcessPool:
+            profiling.restore(armed)
+            raise
+        except services.PoolCallFailed as failed:
+            profiling.restore(failed.leftover)
+            raise failed.error from failed
+        if leftover:
+            profiling.restore(leftover)
+        return result
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -1,17 +1,23 @@
-from typing import Dict
+import hashlib
+from typing import Dict, Optional
 import pdfkit
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, meta
 from pathlib import Path
-import yaml
 from data_models.user_model import UserData
+from utils.config import ConfigStore, Settings, get_config_store
+from utils.profiler import profiled
 
 class ResumeGenerator:
-    def __init__(self):
-        with open("config.yaml") as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_store: Optional[ConfigStore] = None):
+        self.config_store = config_store or get_config_store()
         self.env = Environment(loader=FileSystemLoader("templates"))
+        self._fingerprints: Dict[str, tuple] = {}
+
+    @property
+    def config(self) -> Settings:
+        return self.config_store.get()
         
-    def generate_resume(self, user_data: Dict, template_name: str) -> str:
+    def render_html(self, user_data: Dict, template_name: str) -> str:
         # Validate input
         user = UserData(**user_data)
         
@@ -23,10 +29,39 @@ class ResumeGenerator:
         context["ats_tips"] = self._generate_ats_tips(user)
         
         # Render HTML
-        html_content = template.render(**context)
+        return template.render(**context)
+
+    def template_fingerprint(self, template_name: str) -> str:
+        """Digest of a template and every template it extends, includes or imports"""
+        cached = self._fingerprints.get(template_name)
+        if cached and all(uptodate() for uptodate in cached[1]):
+            return cached[0]
+        digest = hashlib.sha256()
+        checks = []
+        pending, seen = [template_name], set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            source, _, uptodate = self.env.loader.get_source(self.env, name)
+            digest.update(name.encode("utf-8") + b"\0" + source.encode("utf-8") + b"\0")
+            if uptodate:
+                checks.append(uptodate)
+            pending.extend(sorted(ref for ref in meta.find_referenced_templates(self.env.parse(source)) if ref))
+        self._fingerprints[template_name] = (digest.hexdigest(), checks)
+        return digest.hexdigest()
+
+    @profiled("ResumeGenerator.generate_resume")
+    def generate_resume(self, user_data: Dict, template_name: str, html_content: Optional[str] = None,
+                        output_name: Optional[str] = None) -> str:
+        """Write the PDF; ``output_name`` (the stored resume's id) keeps resumes of namesakes apart"""
+        user = UserData(**user_data)
+        if html_content is None:
+            html_content = self.render_html(user_data, template_name)
         
         # Generate PDF
-        output_path = f"generated_resumes/{user.name.replace(' ', '_')}_resume.pdf"
+        output_path = f"generated_resumes/{output_name or user.name.replace(' ', '_')}_resume.pdf"
         Path("generated_resumes").mkdir(exist_ok=True)
         
         pdfkit.from_string(
@@ -43,7 +78,7 @@ class ResumeGenerator:
     def _generate_ats_tips(self, user: UserData) -> list:
         tips = []
         # Check for missing sections
-        for section in self.config["ats"]["required_sections"]:
+        for section in self.config.required_sections:
             if not getattr(user, section.lower()):
                 tips.append(f"Add {section} section for better ATS scoring")
         return tips
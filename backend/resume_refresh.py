@@ -0,0 +1,165 @@
+"""Batch re-render and re-score of stored resumes.
+
+After a template in ``templates/`` or ``ats.keywords`` changes, every stored
+resume whose content hash (user data + template fingerprint + keywords) no longer
+matches is re-rendered and re-scored on a process pool and written back with one
+``bulk_write`` per page. Pages are read by ``_id`` order, and the last committed
+``_id`` is checkpointed, so the job can be stopped and resumed at any point; a
+completed pass removes the checkpoint so the next run scans from the start. A
+token bucket caps the re-render rate so it can run next to live traffic."""
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from backend import services
+from backend.components import Components
+from utils.rate_limit import TokenBucket
+
+PROJECTION = {"user_data": 1, "template": 1, "content_hash": 1}
+
+
+class RefreshCheckpoint:
+    """Last committed ``_id`` plus running counters, written atomically."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {"last_id": None, "scanned": 0, "refreshed": 0, "skipped": 0, "failed": 0}
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            self.state = json.load(f)
+        return True
+
+    @property
+    def last_id(self) -> Optional[ObjectId]:
+        return ObjectId(self.state["last_id"]) if self.state["last_id"] else None
+
+    def clear(self) -> None:
+        """Forget the position once a pass has completed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def save(self, last_id: ObjectId) -> None:
+        self.state["last_id"] = str(last_id)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+class ResumeRefresher:
+    """Walks ``Database.resumes`` page by page and refreshes stale entries.
+
+    Each page is a fresh ``find`` on ``_id > last_id`` (keyset pagination) rather
+    than one long-lived cursor, so a throttled run never holds a server cursor
+    open for hours and a restart costs at most one page of repeated work."""
+
+    def __init__(self, components: Components, config_path: str, checkpoint: RefreshCheckpoint,
+                 workers: int = 2, rate: float = 5.0, burst: float = 10.0, batch_size: int = 100,
+                 dry_run: bool = False, executor_factory: Optional[Callable[[], Executor]] = None,
+                 work: Callable = services.pool_refresh_resume):
+        self.components = components
+        self.config_path = config_path
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.bucket = TokenBucket(rate, burst)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.executor_factory = executor_factory or self._process_pool
+        self.work = work
+        self.keywords = ()
+        self._fingerprints: Dict[str, str] = {}
+
+    def expected_hash(self, user_data: Dict, template_name: str) -> str:
+        """Hash against the templates and keywords as they were when the run started"""
+        if template_name not in self._fingerprints:
+            self._fingerprints[template_name] = self.components.resume_gen.template_fingerprint(f"{template_name}.html")
+        return services.content_hash(user_data, self._fingerprints[template_name], self.keywords)
+
+    def next_page(self, last_id: Optional[ObjectId]) -> List[Dict]:
+        query = {"_id": {"$gt": last_id}} if last_id else {}
+        cursor = self.components.db.resumes.find(query, PROJECTION).sort("_id", 1).limit(self.batch_size)
+        return list(cursor)
+
+    def _process_pool(self) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=services.pool_init,
+            initargs=(self.config_path,)
+        )
+
+    def run(self) -> Dict:
+        settings = self.components.config_store.get()
+        self.keywords = settings.ats_keywords
+        state = self.checkpoint.state
+        last_id = self.checkpoint.last_id
+        started = time.perf_counter()
+
+        executor = self.executor_factory()
+        try:
+            while True:
+                page = self.next_page(last_id)
+                if not page:
+                    if not self.dry_run:
+                        self.checkpoint.clear()
+                    break
+                futures = {}
+                for doc in page:
+                    state["scanned"] += 1
+                    template_name = doc.get("template") or settings.default_template
+                    if template_name not in settings.available_templates:
+                        logging.warning("Resume %s uses unknown template %s; skipping", doc["_id"], template_name)
+                        state["failed"] += 1
+                        continue
+                    digest = self.expected_hash(doc["user_data"], template_name)
+                    if doc.get("content_hash") == digest:
+                        state["skipped"] += 1
+                        continue
+                    if self.dry_run:
+                        state["refreshed"] += 1
+                        continue
+                    self.bucket.acquire()
+                    future = executor.submit(self.work, doc["user_data"], template_name, str(doc["_id"]))
+                    futures[doc["_id"]] = (future, template_name, digest)
+
+                updates = []
+                for resume_id, (future, template_name, digest) in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logging.error("Refreshing resume %s failed: %s", resume_id, e)
+                        state["failed"] += 1
+                        continue
+                    updates.append(UpdateOne({"_id": resume_id}, {"$set": {
+                        "pdf_path": result["pdf_path"],
+                        "analysis": result["analysis"],
+                        "template": template_name,
+                        "content_hash": digest,
+                        "refreshed_at": datetime.now()
+                    }}))
+                if updates:
+                    self.components.db.resumes.bulk_write(updates, ordered=False)
+                    state["refreshed"] += len(updates)
+
+                last_id = page[-1]["_id"]
+                if not self.dry_run:
+                    self.checkpoint.save(last_id)
+                elapsed = time.perf_counter() - started
+                logging.info("Resume refresh: %d scanned, %d refreshed, %d unchanged, %d failed (%.1f/s)",
+                             state["scanned"], state["refreshed"], state["skipped"], state["failed"],
+                             state["scanned"] / elapsed if elapsed else 0.0)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return state
@@ -0,0 +1,199 @@
+"""Request logic shared by the Flask (app.py) and ASGI (asgi.py) front ends.
+
+The front ends only deal with HTTP: sessions, parsing and responses. Everything
+here takes a ``Components`` container and plain values. The ``pool_*`` functions
+are the entry points executed inside the ASGI offload process pool."""
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from bson import ObjectId
+
+# The generator and NLP modules are imported up front (nothing is built) so their
+# @profiled targets are registered before /admin/profile validates a target name
+import backend.resume_generator  # noqa: F401
+import utils.nlp_processor  # noqa: F401
+from backend.components import Components
+from data_models.user_model import UserData
+from utils.config import ConfigStore
+from utils.html_text import html_to_text
+from utils.logging_setup import setup_logging
+from utils.profiler import profiling
+
+
+def chat_turn(services: Components, session_id: str, message: str) -> Tuple[Dict, Dict]:
+    """Run one chat turn; returns the response payload and the session snapshot to persist.
+
+    The saved snapshot, not the chatbot's in-memory copy, is the conversation's
+    source of truth: under a pre-fork server consecutive turns can land on
+    different workers, each with its own ``Chatbot``. The in-memory copy is only
+    used when nothing was saved yet or the database is unreachable."""
+    saved = services.db.get_user_session(session_id)
+    if saved and saved.get('last_state') and 'user_data' in saved:
+        services.chatbot.restore_session(session_id, saved['last_state'], saved['user_data'])
+    bot_response = services.chatbot.process_message(message, session_id)
+    current_progress = services.progress_tracker.update_progress(
+        session_id,
+        bot_response.get('current_state')
+    )
+    chat_session = services.chatbot.sessions[session_id]
+    snapshot = {
+        'user_data': chat_session['user_data'],
+        'last_state': chat_session['state'],
+        'progress': current_progress
+    }
+    payload = {
+        'response': bot_response['text'],
+        'options': bot_response.get('options', []),
+        'progress': current_progress,
+        'session_id': session_id,
+        'current_state': bot_response.get('current_state')
+    }
+    return payload, snapshot
+
+
+def load_user_data(services: Components, session_id: str) -> Optional[UserData]:
+    session_data = services.db.get_user_session(session_id)
+    if not session_data or 'user_data' not in session_data:
+        return None
+    return UserData(**session_data['user_data'])
+
+
+def content_hash(user_data: Dict, template_fingerprint: str, keywords: Sequence[str]) -> str:
+    """Everything a stored resume's PDF and score depend on; unchanged hash means nothing to redo"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(user_data, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\0" + template_fingerprint.encode("ascii") + b"\0")
+    digest.update("\n".join(keywords).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def resume_content_hash(services: Components, user_data: Dict, template_name: str) -> str:
+    return content_hash(
+        user_data,
+        services.resume_gen.template_fingerprint(f"{template_name}.html"),
+        services.config_store.get().ats_keywords
+    )
+
+
+def new_resume_id() -> str:
+    """Allocated before rendering so the PDF can be named after the stored resume"""
+    return str(ObjectId())
+
+
+def render_pdf(services: Components, user_data: Dict, template_name: str, resume_id: str) -> Dict[str, Any]:
+    """Render the HTML and write ``<resume_id>_resume.pdf``; returns its path, plain text and content hash"""
+    html_content = services.resume_gen.render_html(user_data, f"{template_name}.html")
+    pdf_path = services.resume_gen.generate_resume(user_data, f"{template_name}.html", html_content,
+                                                   output_name=resume_id)
+    return {
+        'pdf_path': pdf_path,
+        'resume_text': html_to_text(html_content),
+        'content_hash': resume_content_hash(services, user_data, template_name)
+    }
+
+
+def render_resume(services: Components, user_data: Dict, template_name: str, resume_id: str) -> Dict[str, Any]:
+    """``render_pdf`` plus the HTML preview (the CPU-heavy half of generation)"""
+    rendered = render_pdf(services, user_data, template_name, resume_id)
+    rendered['preview'] = services.resume_gen.get_html_preview(user_data)
+    return rendered
+
+
+def score_resume(services: Components, resume_text: str, domain: Optional[str] = None) -> Dict:
+    return services.ats_analyzer.full_analysis(resume_text, domain=domain)
+
+
+def analyze_text(services: Components, text: str, level: Optional[str] = None) -> Dict:
+    return services.nlp_processor.comprehensive_analysis(text, level)
+
+
+def match_job(services: Components, resume, jd_text: str) -> Dict:
+    """``resume`` is plain resume text or a UserData dict"""
+    return services.ats_analyzer.match_job_description(resume, jd_text)
+
+
+def refresh_resume(services: Components, user_data: Dict, template_name: str, resume_id: str) -> Dict[str, Any]:
+    """Re-render and re-score a stored resume (the batch refresh job's unit of work); no preview"""
+    rendered = render_pdf(services, user_data, template_name, resume_id)
+    return {
+        'pdf_path': rendered['pdf_path'],
+        'analysis': score_resume(services, rendered['resume_text'], user_data.get('domain'))
+    }
+
+
+def resume_payload(resume_id: str, rendered: Dict, ats_report: Dict) -> Dict:
+    return {
+        'pdf_url': f'/download-resume/{resume_id}',
+        'ats_score': ats_report['score'],
+        'ats_tips': ats_report['improvement_tips'],
+        'keyword_matches': ats_report['keyword_matches'],
+        'preview': rendered['preview']
+    }
+
+
+# Offload pool entry points. Each worker process builds its own warmed-up
+# Components once in pool_init and reuses it for every task.
+_pool_components: Optional[Components] = None
+
+
+def pool_init(config_path: str) -> None:
+    global _pool_components
+    config_store = ConfigStore(config_path)
+    # Spawned workers start with bare logging; give them the same queue pipeline and log file
+    setup_logging(config_store.get())
+    profiling.configure(config_store.get())
+    _pool_components = Components(config_store)
+    _pool_components.warmup(freeze=False)
+
+
+def pool_ping() -> bool:
+    return _pool_components is not None
+
+
+class PoolCallFailed(Exception):
+    """``func`` raised inside ``pool_call``; carries its exception and the unused armed counts"""
+
+    def __init__(self, error: Exception, leftover: Dict[str, int]):
+        super().__init__(error, leftover)
+        self.error = error
+        self.leftover = leftover
+
+
+def pool_call(profile: Optional[str], armed: Dict[str, int], func: Callable, *args: Any) -> Tuple[Any, Dict[str, int]]:
+    """Run ``func`` with the front end's profiling requests applied in this worker.
+
+    ``profile`` samples the whole task (X-Profile requests); ``armed`` are the
+    front end's armed @profiled counts. Counts this task didn't use are returned,
+    with the result or, if ``func`` raised, inside ``PoolCallFailed``."""
+    profiling.restore(armed)
+    try:
+        if profile is None:
+            result = func(*args)
+        else:
+            with profiling.profile(f"{profile}_{func.__name__}", thread_ids={threading.get_ident()}):
+                result = func(*args)
+    except Exception as e:
+        raise PoolCallFailed(e, profiling.take_all()) from e
+    return result, profiling.take_all()
+
+
+def pool_render_resume(user_data: Dict, template_name: str, resume_id: str) -> Dict[str, Any]:
+    return render_resume(_pool_components, user_data, template_name, resume_id)
+
+
+def pool_score_resume(resume_text: str, domain: Optional[str] = None) -> Dict:
+    return score_resume(_pool_components, resume_text, domain)
+
+
+def pool_match_job(resume, jd_text: str) -> Dict:
+    return match_job(_pool_components, resume, jd_text)
+
+
+def pool_refresh_resume(user_data: Dict, template_name: str, resume_id: str) -> Dict[str, Any]:
+    return refresh_resume(_pool_components, user_data, template_name, resume_id)
+
+
+def pool_analyze_text(text: str, level: Optional[str] = None) -> Dict:
+    return analyze_text(_pool_components, text, level)
@@ -0,0 +1,30 @@
+# Gunicorn settings for pre-fork serving:  gunicorn -c gunicorn.conf.py
+#
+# The master imports the app and runs Components.warmup() once (spaCy models,
+# templates, gc.freeze()), then forks workers that share those pages
+# copy-on-write. Per-worker state (Mongo client, chat session cache) is dropped
+# by the os.register_at_fork hook installed during warmup and rebuilt lazily.
+# Each chat turn reloads the conversation saved in Mongo, so consecutive turns
+# of one user may be served by different workers.
+# Admission-control slots and session buckets are created in the master as
+# well, in shared memory, so their limits hold across all workers; child_exit
+# below hands back whatever a killed worker was still holding.
+import multiprocessing
+import os
+
+wsgi_app = "app:create_app(warmup=True)"
+preload_app = True
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "sync"
+timeout = 120
+
+
+def child_exit(server, worker):
+    """Reclaim admission slots held by a worker that died mid-request (timeout, OOM kill)"""
+    if not server.cfg.preload_app:
+        return  # each worker built its own controller; nothing shared to reclaim
+    admission = server.app.wsgi().extensions.get("admission")
+    freed = admission.reclaim(worker.pid) if admission else {}
+    if freed:
+        server.log.warning("Reclaimed admission slots %s from dead worker %s", freed, worker.pid)
@@ -0,0 +1,130 @@
+"""Request latency with logging off, with a synchronous file handler, and with the queue pipeline.
+
+    python scripts/bench_logging.py --requests 2000 --threads 4 --lines-per-request 5
+
+Drives ``/analyze-text`` (basic level, admission control off, no database) through
+Flask's test client from several threads. Each request also emits
+``--lines-per-request`` INFO records from an ``after_request`` hook, standing in for
+access and application logs. Modes:
+
+  off    level WARNING, so every INFO call is filtered before any formatting
+  sync   the previous setup: a file handler formatting and writing on the request thread
+  queue  utils.logging_setup: request threads only enqueue, a listener writes JSON lines
+
+Prints one JSON object with mean and p50/p95/p99 latency in milliseconds per mode.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from utils.config import ConfigStore  # noqa: E402
+from utils.logging_setup import setup_logging, stop_logging  # noqa: E402
+
+TEXT = ("Developed a recommendation service and managed a team of six engineers. "
+        "Improved reporting latency and created CI pipelines for cloud migration.")
+MODES = ("off", "sync", "queue")
+
+
+def bench_config(path: str, log_file: str) -> None:
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+    config["nlp"]["analysis_level"] = "basic"
+    config.setdefault("admission", {})["enabled"] = False
+    config["logging"].update({"log_file": log_file, "log_level": "INFO"})
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+
+
+def configure(mode: str, config_store: ConfigStore, log_file: str) -> None:
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    if mode == "queue":
+        setup_logging(config_store.get())
+        return
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root.addHandler(handler)
+    root.setLevel(logging.WARNING if mode == "off" else logging.INFO)
+
+
+def run(app, requests: int, threads: int) -> List[float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker(count: int):
+        client = app.test_client()
+        local = []
+        for _ in range(count):
+            started = time.perf_counter()
+            response = client.post("/analyze-text", json={"text": TEXT})
+            local.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.status_code
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(requests // threads,)) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--lines-per-request", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.yaml")
+        log_file = os.path.join(tmpdir, "app.log")
+        bench_config(config_path, log_file)
+        config_store = ConfigStore(config_path)
+        app = create_app(config_store=config_store)
+
+        @app.after_request
+        def emit_logs(response):
+            for i in range(args.lines_per_request):
+                logging.info("%s %s -> %s (%d/%d)", "POST", "/analyze-text", response.status_code,
+                             i + 1, args.lines_per_request)
+            return response
+
+        results = {}
+        for mode in MODES:
+            configure(mode, config_store, log_file)
+            run(app, min(args.requests, 100), args.threads)  # warm-up
+            results[mode] = summarize(run(app, args.requests, args.threads))
+        stop_logging()
+        print(json.dumps({"requests": args.requests, "threads": args.threads,
+                          "lines_per_request": args.lines_per_request, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Per-document cost of NLPProcessor.comprehensive_analysis in basic vs deep mode.
+
+    python scripts/bench_nlp.py --docs 200
+    python scripts/bench_nlp.py --levels basic    # no model download needed
+
+Basic runs the tokenizer + sentencizer only; deep adds the tagger, parser, NER
+and entity ruler of the configured model. Model load time is reported separately
+from the steady-state per-document cost.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import ConfigStore  # noqa: E402
+from utils.nlp_processor import BASIC, DEEP, NLPProcessor  # noqa: E402
+
+PARAGRAPHS = [
+    "Senior software engineer at Acme Corp with eight years of experience in machine learning "
+    "and data analysis. Developed a recommendation service that improved retention by 12 percent.",
+    "Managed a team of six engineers delivering cloud migration projects for Globex. "
+    "Created CI pipelines and mentored junior developers in project management practices.",
+    "MSc in Computer Science from the University of Edinburgh. Built dashboards for "
+    "finance stakeholders and improved reporting latency from hours to minutes.",
+]
+
+
+def make_documents(count: int, paragraphs_per_doc: int):
+    return [
+        " ".join(PARAGRAPHS[(i + j) % len(PARAGRAPHS)] for j in range(paragraphs_per_doc))
+        for i in range(count)
+    ]
+
+
+def bench(processor: NLPProcessor, level: str, documents) -> dict:
+    processor.comprehensive_analysis(documents[0], level)  # first-call allocations
+    timings = []
+    for document in documents:
+        started = time.perf_counter()
+        processor.comprehensive_analysis(document, level)
+        timings.append(time.perf_counter() - started)
+    return {
+        "level": level,
+        "docs": len(documents),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p95_ms": round(sorted(timings)[int(len(timings) * 0.95) - 1] * 1000, 3),
+        "docs_per_s": round(len(documents) / sum(timings), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=6, help="paragraphs per document")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--levels", nargs="+", choices=(BASIC, DEEP), default=[BASIC, DEEP])
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs, args.paragraphs)
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    # Deep mode loads the model in the constructor; basic-only runs must not
+    config["nlp"]["analysis_level"] = DEEP if DEEP in args.levels else BASIC
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(config, f)
+        config_store = ConfigStore(config_path)
+
+        started = time.perf_counter()
+        processor = NLPProcessor(config_store=config_store)
+        init_s = time.perf_counter() - started
+        timings = {"init_s": round(init_s, 3)}
+        if DEEP in args.levels:
+            started = time.perf_counter()
+            processor.nlp
+            timings["deep_model_load_s"] = round(time.perf_counter() - started, 3)
+
+        print(json.dumps(timings))
+        for level in args.levels:
+            print(json.dumps(bench(processor, level, documents)))
+
+
+if __name__ == "__main__":
+    main()
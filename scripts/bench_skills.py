@@ -0,0 +1,93 @@
+"""Skill extraction throughput and load time against taxonomy size.
+
+    python scripts/bench_skills.py --sizes 1000 10000 50000 100000
+
+Builds synthetic taxonomies (each skill with two aliases), compiles them to a
+temporary file, then reports file size, mmap open time and extraction
+throughput over synthetic resume text containing a mix of known skills and
+filler words. Uses the dependency-free tokenizer so only the matcher is timed.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.skill_taxonomy import SkillTaxonomy, compile_taxonomy, simple_tokenize  # noqa: E402
+
+WORDS = ("data cloud stream graph secure neural quantum mobile web embedded "
+         "analytics platform network vision speech robotic financial clinical").split()
+FILLER = ("led the team that delivered a new system for customers and improved "
+          "results across several regions while working with stakeholders").split()
+
+
+def synthetic_taxonomy(size: int, rng: random.Random):
+    entries = []
+    for i in range(size):
+        words = rng.sample(WORDS, rng.randint(1, 3)) + [f"skill{i}"]
+        name = " ".join(words)
+        entries.append({
+            "id": f"SK{i:06d}",
+            "name": name,
+            "aliases": [name.replace(" ", "-"), f"{words[-1]} {words[0]}"],
+        })
+    return entries
+
+
+def synthetic_documents(entries, count: int, tokens_per_doc: int, rng: random.Random):
+    documents = []
+    for _ in range(count):
+        parts = []
+        while len(parts) < tokens_per_doc:
+            if rng.random() < 0.1:
+                parts.extend(rng.choice(entries)["name"].split())
+            else:
+                parts.append(rng.choice(FILLER))
+        documents.append(simple_tokenize(" ".join(parts)))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 100000])
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--tokens", type=int, default=600, help="tokens per document")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            entries = synthetic_taxonomy(size, rng)
+            started = time.perf_counter()
+            data = compile_taxonomy(entries)
+            compile_s = time.perf_counter() - started
+            path = os.path.join(tmpdir, f"skills_{size}.taxonomy")
+            with open(path, "wb") as f:
+                f.write(data)
+
+            started = time.perf_counter()
+            taxonomy = SkillTaxonomy.open(path)
+            open_ms = (time.perf_counter() - started) * 1000
+
+            documents = synthetic_documents(entries, args.docs, args.tokens, rng)
+            started = time.perf_counter()
+            found = sum(len(taxonomy.extract(tokens, 0.85)) for tokens in documents)
+            elapsed = time.perf_counter() - started
+            print(json.dumps({
+                "skills": size,
+                "phrases": taxonomy.phrase_count,
+                "file_kib": round(len(data) / 1024, 1),
+                "compile_s": round(compile_s, 2),
+                "open_ms": round(open_ms, 3),
+                "docs_per_s": round(len(documents) / elapsed, 1),
+                "tokens_per_s": round(len(documents) * args.tokens / elapsed),
+                "skills_found_per_doc": round(found / len(documents), 1),
+            }))
+
+
+if __name__ == "__main__":
+    main()
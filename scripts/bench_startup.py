@@ -0,0 +1,107 @@
+"""Measure cold-start time and per-worker memory for the two ways of forking workers.
+
+    python scripts/bench_startup.py --workers 4
+
+``per-worker``: the master only calls create_app(); every forked worker loads the
+models itself (what a non-preloading server does, and what importing the old
+app.py did in each worker).
+``preload``: the master runs Components.warmup() (models + gc.freeze()) before
+forking, so workers share those pages copy-on-write.
+
+For each worker we report RSS, PSS (RSS with shared pages divided among sharers)
+and USS (pages private to that worker) from /proc/<pid>/smaps_rollup.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_TEXT = (
+    "Experienced software engineer who developed data analysis pipelines and "
+    "managed a team of five. Improved deployment time by 40 percent at Acme Corp."
+)
+
+
+def memory_kb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def run_mode(mode: str, workers: int, config_path: str) -> dict:
+    from app import create_app
+
+    started = time.perf_counter()
+    app = create_app(config_path, warmup=(mode == "preload"))
+    master_ready = time.perf_counter() - started
+    services = app.extensions["components"]
+
+    children = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            worker_started = time.perf_counter()
+            if mode == "per-worker":
+                services.warmup(freeze=False)
+            services.nlp_processor.analyze_resume_text(SAMPLE_TEXT)
+            first_request = time.perf_counter() - worker_started
+            os.write(write_fd, json.dumps({"first_request_s": first_request}).encode())
+            os.close(write_fd)
+            time.sleep(3600)
+            os._exit(0)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    results = []
+    for pid, read_fd in children:
+        with os.fdopen(read_fd) as pipe:
+            report = json.loads(pipe.read())
+        results.append(report)
+    # Sample memory only once every worker has served its first request
+    for (pid, _), report in zip(children, results):
+        report.update(memory_kb(pid))
+    for pid, _ in children:
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+
+    return {
+        "mode": mode,
+        "master_ready_s": round(master_ready, 3),
+        "slowest_first_request_s": round(max(r["first_request_s"] for r in results), 3),
+        "avg_rss_mb": round(sum(r["rss"] for r in results) / len(results) / 1024, 1),
+        "avg_pss_mb": round(sum(r["pss"] for r in results) / len(results) / 1024, 1),
+        "avg_uss_mb": round(sum(r["uss"] for r in results) / len(results) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--mode", choices=["per-worker", "preload"], action="append")
+    args = parser.parse_args()
+
+    for mode in args.mode or ["per-worker", "preload"]:
+        # Each mode runs in a fresh interpreter so module caches don't leak between them
+        pid = os.fork()
+        if pid == 0:
+            print(json.dumps(run_mode(mode, args.workers, args.config)), flush=True)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compile a skill taxonomy (YAML or JSONL) into the memory-mapped binary format.
+
+    python scripts/compile_skill_taxonomy.py data/skills_taxonomy.yaml data/skills.taxonomy
+
+Phrases are tokenized with spaCy's English tokenizer, the same one NLPProcessor
+uses at runtime, so token boundaries match exactly. Pass ``--simple-tokenizer``
+to compile without spaCy (tests and benchmarks only).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.skill_taxonomy import (  # noqa: E402
+    SkillTaxonomy, compile_taxonomy, load_taxonomy_source, simple_tokenize, write_taxonomy
+)
+
+
+def spacy_tokenizer():
+    import spacy
+    nlp = spacy.blank("en")
+    return lambda text: [token.lower_ for token in nlp.make_doc(text) if not token.is_space]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="taxonomy source (.yaml/.yml or .jsonl)")
+    parser.add_argument("output", help="compiled taxonomy path")
+    parser.add_argument("--simple-tokenizer", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    entries = load_taxonomy_source(args.source)
+    tokenize = simple_tokenize if args.simple_tokenizer else spacy_tokenizer()
+    data = compile_taxonomy(entries, tokenize)
+
+    write_taxonomy(data, args.output)
+
+    taxonomy = SkillTaxonomy.open(args.output)
+    print(f"Compiled {taxonomy.skill_count} skills / {taxonomy.phrase_count} phrases "
+          f"into {args.output} ({len(data) / 1024:.1f} KiB) in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
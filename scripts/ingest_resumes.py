@@ -0,0 +1,239 @@
+"""Bulk-parse existing plain-text/HTML resumes into validated UserData JSONL.
+
+    python scripts/ingest_resumes.py partner_dump/ --out records.jsonl \\
+        --rejects rejects.jsonl --n-process 4 --batch-size 64
+
+Files stream through NLPProcessor's spaCy pipeline with ``nlp.pipe(n_process=...)``
+(only the NER/entity-ruler components run), the extracted entities are mapped onto
+UserData, and every input ends up as exactly one line in either the records file
+or the rejects file. Memory stays bounded by the batch size no matter how many
+files there are.
+
+The run is resumable: every ``--checkpoint-every`` documents the output files are
+flushed and their sizes recorded in ``<out>.checkpoint``. Re-running the same
+command truncates the outputs back to the last checkpoint and continues from the
+next input, so a crash never duplicates or loses records.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import ValidationError  # noqa: E402
+
+from data_models.user_model import UserData  # noqa: E402
+from utils.config import ConfigStore  # noqa: E402
+from utils.html_text import html_to_text  # noqa: E402
+from utils.nlp_processor import ENTITY_PIPES, NLPProcessor  # noqa: E402
+
+INPUT_EXTENSIONS = {".txt", ".text", ".md", ".html", ".htm"}
+MAX_CHARS = 100_000
+MAX_SKILLS = 15
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+YEAR_PATTERN = re.compile(r"\b(19|20)\d{2}\b")
+CERTIFICATION_PATTERN = re.compile(r"\b(certified|certificate|certification)\b", re.IGNORECASE)
+
+
+def list_inputs(paths: List[str]) -> List[str]:
+    """Every resume file under the given paths, in a stable order (checkpoints index into it)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names)
+                             if os.path.splitext(name)[1].lower() in INPUT_EXTENSIONS)
+        else:
+            files.append(path)
+    return files
+
+
+def read_inputs(files: List[str], start: int) -> Iterator[Tuple[str, Dict]]:
+    """(text, context) pairs for nlp.pipe(as_tuples=True); unreadable files carry an error instead.
+
+    The context only holds small metadata: with ``n_process > 1`` it is pickled to
+    the worker and back, so the text itself travels once, inside the doc."""
+    for index in range(start, len(files)):
+        path = files[index]
+        context = {"index": index, "source": path}
+        text = ""
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                text = f.read(MAX_CHARS * 4)
+            if os.path.splitext(path)[1].lower() in (".html", ".htm"):
+                text = html_to_text(text)
+        except OSError as e:
+            context["error"] = f"Unreadable file: {e}"
+        yield text[:MAX_CHARS], context
+
+
+def normalize_phone(text: str) -> Optional[str]:
+    """First phone-like run that fits UserData's E.164 pattern (10+ digits so year ranges don't qualify)"""
+    for candidate in PHONE_PATTERN.findall(text):
+        digits = re.sub(r"\D", "", candidate)
+        if 10 <= len(digits) <= 15 and digits[0] != "0":
+            return ("+" if candidate.startswith("+") else "") + digits
+    return None
+
+
+def map_entities(doc, processor: NLPProcessor) -> Dict:
+    """Map one parsed resume onto UserData fields; anything not found keeps the model default."""
+    text = doc.text
+    fields: Dict = {}
+    person = next((ent.text for ent in doc.ents if ent.label_ == "PERSON" and ent.start < 60), None)
+    if person:
+        fields["name"] = person
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        fields["email"] = email.group(0)
+    phone = normalize_phone(text)
+    if phone:
+        fields["phone"] = phone
+
+    fields["skills"] = [match.name for match in processor.skill_matches(doc)][:MAX_SKILLS]
+
+    education = []
+    for ent in doc.ents:
+        if ent.label_ != "DEGREE":
+            continue
+        # Degree, institution and year are expected on the same line
+        line_start = text.rfind("\n", 0, ent.start_char) + 1
+        line_end = text.find("\n", ent.end_char)
+        line_end = len(text) if line_end < 0 else line_end
+        line = text[line_start:line_end]
+        institution = next((e.text for e in doc.ents if e.label_ == "ORG"
+                            and line_start <= e.start_char < line_end), None)
+        year = YEAR_PATTERN.search(line)
+        if institution and year:
+            education.append({"degree": ent.text, "institution": institution,
+                              "graduation_year": int(year.group(0))})
+    fields["education"] = education
+
+    fields["certifications"] = [
+        line.strip()[:100] for line in text.splitlines()
+        if CERTIFICATION_PATTERN.search(line) and len(line.strip()) > 3
+    ][:10]
+    return fields
+
+
+class Checkpoint:
+    """Progress marker written atomically next to the records file."""
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.state = {"fingerprint": fingerprint, "processed": 0, "records": 0, "rejects": 0,
+                      "out_bytes": 0, "rejects_bytes": 0}
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("fingerprint") != self.fingerprint:
+            raise SystemExit(f"{self.path} belongs to a different input set; pass --restart to start over")
+        self.state = state
+        return True
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def open_output(path: str, resume_at: int):
+    """Open for appending after truncating anything written past the last checkpoint."""
+    f = open(path, "a+b")
+    f.truncate(resume_at)
+    f.seek(resume_at)
+    return f
+
+
+def report(processed: int, total: int, records: int, rejects: int, started: float, resumed_from: int) -> None:
+    elapsed = time.perf_counter() - started
+    rate = (processed - resumed_from) / elapsed if elapsed else 0.0
+    eta = (total - processed) / rate if rate else 0.0
+    print(f"[{processed}/{total}] {rate:.1f} docs/s, {records} records, {rejects} rejects, "
+          f"eta {eta:.0f}s", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="resume files or directories")
+    parser.add_argument("--out", required=True, help="validated UserData records (JSONL)")
+    parser.add_argument("--rejects", required=True, help="inputs that failed parsing or validation (JSONL)")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--n-process", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--checkpoint-every", type=int, default=500)
+    parser.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start over")
+    args = parser.parse_args()
+
+    files = list_inputs(args.inputs)
+    fingerprint = hashlib.sha256("\n".join(files).encode("utf-8")).hexdigest()
+    checkpoint = Checkpoint(f"{args.out}.checkpoint", fingerprint)
+    if not args.restart and checkpoint.load():
+        print(f"Resuming after {checkpoint.state['processed']} of {len(files)} inputs", file=sys.stderr)
+    state = checkpoint.state
+
+    processor = NLPProcessor(config_store=ConfigStore(args.config))
+    nlp = processor.nlp
+    disabled = [name for name in nlp.pipe_names if name not in ENTITY_PIPES]
+
+    resumed_from = state["processed"]
+    started = last_report = time.perf_counter()
+    with open_output(args.out, state["out_bytes"]) as out, open_output(args.rejects, state["rejects_bytes"]) as rejects:
+        docs = nlp.pipe(read_inputs(files, resumed_from), as_tuples=True, disable=disabled,
+                        batch_size=args.batch_size, n_process=args.n_process)
+        for doc, context in docs:
+            source = context["source"]
+            error = context.get("error")
+            if not error and not doc.text.strip():
+                error = "Empty document"
+            if not error:
+                try:
+                    user_data = UserData(**map_entities(doc, processor))
+                except ValidationError as e:
+                    error = json.loads(e.json())
+            if error:
+                rejects.write((json.dumps({"source": source, "error": error}) + "\n").encode("utf-8"))
+                state["rejects"] += 1
+            else:
+                out.write((json.dumps({"source": source, "user_data": user_data.dict()}) + "\n").encode("utf-8"))
+                state["records"] += 1
+            state["processed"] = context["index"] + 1
+
+            if state["processed"] % args.checkpoint_every == 0:
+                for f in (out, rejects):
+                    f.flush()
+                    os.fsync(f.fileno())
+                state["out_bytes"], state["rejects_bytes"] = out.tell(), rejects.tell()
+                checkpoint.save()
+            now = time.perf_counter()
+            if now - last_report >= args.progress_every:
+                report(state["processed"], len(files), state["records"], state["rejects"], started, resumed_from)
+                last_report = now
+
+        for f in (out, rejects):
+            f.flush()
+            os.fsync(f.fileno())
+        state["out_bytes"], state["rejects_bytes"] = out.tell(), rejects.tell()
+        checkpoint.save()
+
+    report(state["processed"], len(files), state["records"], state["rejects"], started, resumed_from)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Measure /chat throughput while resume generations are in flight.
+
+Start a server (``gunicorn -c gunicorn.conf.py`` or ``uvicorn asgi:app``), then:
+
+    python scripts/load_driver.py --base-url http://localhost:5000 \\
+        --chat-clients 16 --generate-clients 4 --duration 30
+
+Run once with ``--generate-clients 0`` for the baseline. Prints one JSON line
+with chat requests/s, chat latency percentiles and completed generations.
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.cookiejar import CookieJar
+from typing import List
+
+
+class Client:
+    """One browser-like session: its own cookie jar, so each client has its own chat state."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    def get(self, path: str) -> int:
+        with self.opener.open(self.base_url + path, timeout=120) as response:
+            response.read()
+            return response.status
+
+    def post(self, path: str, payload: dict) -> int:
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with self.opener.open(request, timeout=120) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--chat-clients", type=int, default=16)
+    parser.add_argument("--generate-clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--template", default="modern")
+    args = parser.parse_args()
+
+    deadline = time.monotonic() + args.duration
+    lock = threading.Lock()
+    chat_latencies: List[float] = []
+    stats = {"chat_errors": 0, "generations": 0, "generation_errors": 0}
+
+    def chat_loop():
+        client = Client(args.base_url)
+        client.get("/")
+        messages = ["hi", "IT"]
+        turn = 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            status = client.post("/chat", {"message": messages[turn % len(messages)]})
+            elapsed = time.perf_counter() - started
+            turn += 1
+            with lock:
+                if status == 200:
+                    chat_latencies.append(elapsed)
+                else:
+                    stats["chat_errors"] += 1
+
+    def generate_loop():
+        client = Client(args.base_url)
+        client.get("/")
+        client.post("/chat", {"message": "hi"})
+        while time.monotonic() < deadline:
+            status = client.post("/generate-resume", {"template": args.template})
+            with lock:
+                stats["generations" if status == 200 else "generation_errors"] += 1
+
+    threads = [threading.Thread(target=chat_loop) for _ in range(args.chat_clients)]
+    threads += [threading.Thread(target=generate_loop) for _ in range(args.generate_clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    print(json.dumps({
+        "base_url": args.base_url,
+        "chat_clients": args.chat_clients,
+        "generate_clients": args.generate_clients,
+        "duration_s": round(elapsed, 1),
+        "chat_rps": round(len(chat_latencies) / elapsed, 1),
+        "chat_p50_ms": round(percentile(chat_latencies, 50) * 1000, 1),
+        "chat_p95_ms": round(percentile(chat_latencies, 95) * 1000, 1),
+        "chat_p99_ms": round(percentile(chat_latencies, 99) * 1000, 1),
+        **stats,
+    }))
+
+
+if __name__ == "__main__":
+    main()
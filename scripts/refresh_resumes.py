@@ -0,0 +1,61 @@
+"""Re-render and re-score stored resumes after a template or ats.keywords change.
+
+    python scripts/refresh_resumes.py                 # resume from the checkpoint
+    python scripts/refresh_resumes.py --restart       # scan the whole collection again
+    python scripts/refresh_resumes.py --dry-run       # count stale resumes, write nothing
+
+Defaults come from ``maintenance.resume_refresh`` in config.yaml. Safe to stop at
+any time: the next run continues after the last page that was written back. Once
+a pass completes the checkpoint is removed and the next run starts over.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.components import Components  # noqa: E402
+from backend.resume_refresh import RefreshCheckpoint, ResumeRefresher  # noqa: E402
+from utils.config import ConfigStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--rate", type=float, help="resumes re-rendered per second")
+    parser.add_argument("--burst", type=float)
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first resume")
+    parser.add_argument("--dry-run", action="store_true", help="only count resumes that would be refreshed")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    config_store = ConfigStore(args.config)
+    settings = dict(config_store.get().get("maintenance", {}).get("resume_refresh", {}))
+    checkpoint = RefreshCheckpoint(args.checkpoint or settings.get("checkpoint", "./logs/resume_refresh.checkpoint"))
+    if not args.restart and not args.dry_run and checkpoint.load():
+        logging.info("Resuming after resume %s", checkpoint.state["last_id"])
+
+    components = Components(config_store)
+    refresher = ResumeRefresher(
+        components,
+        args.config,
+        checkpoint,
+        workers=args.workers or int(settings.get("workers", 2)),
+        rate=args.rate or float(settings.get("rate_per_second", 5)),
+        burst=args.burst or float(settings.get("burst", 10)),
+        batch_size=args.batch_size or int(settings.get("batch_size", 100)),
+        dry_run=args.dry_run
+    )
+    try:
+        print(json.dumps(refresher.run(), indent=2))
+    finally:
+        components.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+import unittest
+from http import HTTPStatus
+
+from backend.admission import AdmissionController, Shed
+
+SETTINGS = {
+    "admission": {
+        "session_rate": {"rate_per_second": 0.001, "burst": 3},
+        "classes": {"pdf": {"concurrency": 1, "queue_timeout": 0.05, "max_queue": 1}},
+    }
+}
+
+
+class TestAdmissionController(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = AdmissionController(SETTINGS)
+
+    def test_session_over_its_rate_gets_429(self):
+        for _ in range(3):
+            self.controller.check_session("alice")
+        with self.assertRaises(Shed) as shed:
+            self.controller.check_session("alice")
+        self.assertEqual(shed.exception.status, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(shed.exception.retry_after, 1)
+        self.controller.check_session("bob")
+
+    def test_full_class_waits_then_sheds_with_503(self):
+        with self.controller.admit("alice", "pdf"):
+            with self.assertRaises(Shed) as shed:
+                with self.controller.admit("bob", "pdf"):
+                    pass
+        self.assertEqual(shed.exception.status, HTTPStatus.SERVICE_UNAVAILABLE)
+        with self.controller.admit("carol", "pdf"):
+            pass
+        self.assertEqual(self.controller.metrics()["classes"]["pdf"],
+                         {"admitted": 2, "queued": 0, "shed": 1, "in_flight": 0, "waiting": 0, "concurrency": 1})
+
+    def test_queued_request_is_admitted_when_slot_frees(self):
+        pdf = self.controller.classes["pdf"]
+        pdf.queue_timeout = 2.0
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pdf.slot():
+                holding.set()
+                release.wait()
+
+        worker = threading.Thread(target=hold)
+        worker.start()
+        holding.wait()
+        threading.Timer(0.05, release.set).start()
+        with pdf.slot():
+            pass
+        worker.join()
+        self.assertEqual(pdf.counters, {"admitted": 1, "queued": 1, "shed": 0})
+
+    def test_async_admission_sheds_without_blocking_the_loop(self):
+        async def scenario():
+            async with self.controller.admit_async("alice", "pdf"):
+                with self.assertRaises(Shed):
+                    async with self.controller.admit_async("bob", "pdf"):
+                        pass
+
+        asyncio.run(scenario())
+        self.assertEqual(self.controller.metrics()["classes"]["pdf"]["shed"], 1)
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+class TestAdmissionAcrossForkedWorkers(unittest.TestCase):
+    """The controller is built before forking, as in the gunicorn master, so workers share its limits"""
+
+    def setUp(self):
+        self.controller = AdmissionController(SETTINGS)
+        self.fork = multiprocessing.get_context("fork")
+
+    def test_slot_held_in_one_worker_sheds_in_another(self):
+        holding, release = self.fork.Event(), self.fork.Event()
+
+        def hold():
+            with self.controller.admit("alice", "pdf"):
+                holding.set()
+                release.wait(5)
+
+        worker = self.fork.Process(target=hold)
+        worker.start()
+        try:
+            self.assertTrue(holding.wait(5))
+            self.assertEqual(self.controller.metrics()["classes"]["pdf"]["in_flight"], 1)
+            with self.assertRaises(Shed):
+                with self.controller.admit("bob", "pdf"):
+                    pass
+        finally:
+            release.set()
+            worker.join(5)
+        with self.controller.admit("bob", "pdf"):
+            pass
+
+    def test_slot_of_a_killed_worker_is_reclaimed(self):
+        holding = self.fork.Event()
+
+        def hold_until_killed():
+            with self.controller.admit("alice", "pdf"):
+                holding.set()
+                os.kill(os.getpid(), signal.SIGKILL)
+
+        worker = self.fork.Process(target=hold_until_killed)
+        worker.start()
+        self.assertTrue(holding.wait(5))
+        worker.join(5)
+        self.assertEqual(worker.exitcode, -signal.SIGKILL)
+        with self.assertRaises(Shed):
+            with self.controller.admit("bob", "pdf"):
+                pass
+
+        self.assertEqual(self.controller.reclaim(worker.pid), {"pdf": 1})
+        self.assertEqual(self.controller.reclaim(worker.pid), {})
+        self.assertEqual(self.controller.metrics()["classes"]["pdf"]["in_flight"], 0)
+        with self.controller.admit("carol", "pdf"):
+            pass
+
+    def test_session_rate_is_shared(self):
+        worker = self.fork.Process(target=lambda: [self.controller.check_session("alice") for _ in range(3)])
+        worker.start()
+        worker.join(5)
+        self.assertEqual(worker.exitcode, 0)
+        with self.assertRaises(Shed) as shed:
+            self.controller.check_session("alice")
+        self.assertEqual(shed.exception.status, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(self.controller.metrics()["session"]["admitted"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
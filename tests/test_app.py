@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from app import create_app
+from utils.config import ConfigError
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+
+
+class TestCreateApp(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(CONFIG_PATH) as f:
+            self.raw = yaml.safe_load(f)
+        self.raw["nlp"]["analysis_level"] = "basic"
+        self.raw["logging"]["log_file"] = os.path.join(self.tmpdir.name, "app.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def app(self, debug, secret_key="your-secret-key-here", environ=None):
+        self.raw["app"].update({"debug": debug, "secret_key": secret_key})
+        path = os.path.join(self.tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(self.raw, f)
+        with mock.patch.dict(os.environ, environ or {}, clear=False):
+            if environ is None:
+                os.environ.pop("SECRET_KEY", None)
+            return create_app(path)
+
+    def test_placeholder_secret_key_is_refused_outside_debug(self):
+        with self.assertRaises(ConfigError):
+            self.app(debug=False)
+        with self.assertRaises(ConfigError):
+            self.app(debug=False, secret_key="")
+
+    def test_debug_without_key_gets_a_random_one(self):
+        first, second = self.app(debug=True), self.app(debug=True)
+        self.assertNotIn(first.secret_key, ("", "your-secret-key-here"))
+        self.assertNotEqual(first.secret_key, second.secret_key)
+
+    def test_environment_key_wins(self):
+        app = self.app(debug=False, environ={"SECRET_KEY": "from-env"})
+        self.assertEqual(app.secret_key, "from-env")
+        self.assertEqual(self.app(debug=False, secret_key="configured").secret_key, "configured")
+
+
+class FakeDatabase:
+    """Session store shared by both app instances, standing in for Mongo"""
+
+    def __init__(self):
+        self.sessions = {}
+
+    def get_user_session(self, session_id):
+        return self.sessions.get(session_id)
+
+    def save_user_session(self, session_id, data):
+        self.sessions[session_id] = data
+        return True
+
+
+class TestChatAcrossWorkers(unittest.TestCase):
+    """Two app instances play two pre-fork workers, each with its own Chatbot"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["nlp"]["analysis_level"] = "basic"
+        raw["logging"]["log_file"] = os.path.join(self.tmpdir.name, "app.log")
+        path = os.path.join(self.tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(raw, f)
+        self.database = database = FakeDatabase()
+        with mock.patch.dict(os.environ, {"SECRET_KEY": "shared"}):
+            self.workers = [create_app(path), create_app(path)]
+        for app in self.workers:
+            app.extensions["components"]._instances["db"] = database
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_conversation_continues_on_another_worker(self):
+        first, second = (app.test_client() for app in self.workers)
+        first.get("/")
+        self.assertIn("domain", first.post("/chat", json={"message": "Hi"}).get_json()["response"])
+
+        second.set_cookie("session", first.get_cookie("session").value)
+        response = second.post("/chat", json={"message": "IT"}).get_json()
+        self.assertIn("Great choice", response["response"])
+        saved = next(iter(self.database.sessions.values()))
+        self.assertEqual(saved["last_state"], "experience")
+        self.assertEqual(saved["user_data"]["domain"], "IT")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+from starlette.testclient import TestClient
+
+from asgi import create_asgi_app
+from utils.logging_setup import stop_logging
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+
+
+class TestAsgiApp(unittest.TestCase):
+    """Smoke test: lifespan starts and stops the offload pool, basic routes answer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        with open(CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["nlp"]["analysis_level"] = "basic"
+        raw["logging"]["log_file"] = os.path.join(cls.tmpdir.name, "app.log")
+        raw["serving"]["async"]["process_pool_size"] = 1
+        raw["profiling"].update({"enabled": True, "admin_token": "s3cret",
+                                 "output_dir": os.path.join(cls.tmpdir.name, "profiles")})
+        cls.config_path = os.path.join(cls.tmpdir.name, "config.yaml")
+        with open(cls.config_path, "w") as f:
+            yaml.safe_dump(raw, f)
+        with mock.patch.dict(os.environ, {"SECRET_KEY": "test"}):
+            cls.client = TestClient(create_asgi_app(cls.config_path))
+        cls.client.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.__exit__(None, None, None)
+        stop_logging()
+        cls.tmpdir.cleanup()
+
+    def test_index_renders(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/html", response.headers["content-type"])
+
+    def test_analyze_text_runs_in_the_pool(self):
+        response = self.client.post("/analyze-text", json={"text": "Developed and managed a Python service."})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["analysis_level"], "basic")
+
+    def test_admin_routes_hidden_without_token(self):
+        self.assertEqual(self.client.get("/admin/admission").status_code, 404)
+        self.assertEqual(self.client.post("/admin/profile", json={"seconds": 1}).status_code, 404)
+
+    def test_x_profile_request_writes_collapsed_stacks(self):
+        response = self.client.post("/analyze-text", json={"text": "Managed a team."},
+                                    headers={"X-Profile": "s3cret"})
+        self.assertEqual(response.status_code, 200)
+        profiles = os.listdir(os.path.join(self.tmpdir.name, "profiles"))
+        self.assertTrue(any(name.startswith("request_analyze-text") for name in profiles), profiles)
+
+    def test_admin_profile_rejects_unknown_target(self):
+        response = self.client.post("/admin/profile", json={"target": "no.such.target"},
+                                    headers={"X-Admin-Token": "s3cret"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
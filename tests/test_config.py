@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from utils.config import ConfigError, ConfigStore, Settings
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+
+
+class TestConfigStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "config.yaml")
+        shutil.copy(CONFIG_PATH, self.path)
+        with open(self.path) as f:
+            self.raw = yaml.safe_load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, raw, mtime_offset=10):
+        with open(self.path, "w") as f:
+            yaml.safe_dump(raw, f)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset * 10**9))
+
+    def test_precomputes_derived_structures(self):
+        settings = ConfigStore(self.path).get()
+        self.assertEqual(settings.domain_lookup["healthcare"], "Healthcare")
+        self.assertIn("skip", settings.skip_keywords)
+        self.assertEqual(settings.ats_keywords_lower[0], "project management")
+        self.assertIn(".png", settings.allowed_extensions)
+        section, pattern = settings.section_patterns[0]
+        self.assertEqual(section, "Experience")
+        self.assertTrue(pattern.search("WORK EXPERIENCE"))
+        self.assertEqual(settings["app"]["port"], 5000)
+
+    def test_snapshot_is_immutable(self):
+        settings = ConfigStore(self.path).get()
+        with self.assertRaises(TypeError):
+            settings["ats"]["keywords"][0] = "changed"
+        with self.assertRaises(TypeError):
+            settings["app"]["port"] = 1
+
+    def test_reloads_when_file_changes(self):
+        store = ConfigStore(self.path, check_interval=0)
+        before = store.get()
+        self.raw["ats"]["keywords"].append("cloud computing")
+        self._write(self.raw)
+        after = store.get()
+        self.assertIsNot(before, after)
+        self.assertIn("cloud computing", after.ats_keywords)
+        self.assertNotIn("cloud computing", before.ats_keywords)
+
+    def test_invalid_reload_keeps_previous_snapshot(self):
+        store = ConfigStore(self.path, check_interval=0)
+        before = store.get()
+        self.raw["chatbot"]["domains"] = []
+        self._write(self.raw)
+        with self.assertLogs(level="ERROR"):
+            self.assertIs(store.get(), before)
+
+    def test_validation_rejects_missing_sections(self):
+        del self.raw["ats"]
+        with self.assertRaises(ConfigError):
+            Settings.from_dict(self.raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
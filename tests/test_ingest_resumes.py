@@ -0,0 +1,129 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import spacy
+import yaml
+
+from utils.config import ConfigStore
+from utils.nlp_processor import NLPProcessor
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+CONFIG_PATH = os.path.join(ROOT, "config.yaml")
+
+_spec = importlib.util.spec_from_file_location("ingest_resumes", os.path.join(ROOT, "scripts", "ingest_resumes.py"))
+ingest = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ingest)
+
+RESUME = """Jane Doe
+jane.doe@example.com | +44 (20) 7946-0958 | 2015-2019
+MSc at Edinburgh University, 2014
+Skills: machine learning, data analysis
+AWS Certified Solutions Architect
+"""
+
+
+class TestNormalizePhone(unittest.TestCase):
+
+    def test_keeps_e164_shape(self):
+        self.assertEqual(ingest.normalize_phone("call +44 (20) 7946-0958 today"), "+442079460958")
+        self.assertEqual(ingest.normalize_phone("555-123-4567"), "5551234567")
+
+    def test_rejects_year_ranges_and_short_or_leading_zero_numbers(self):
+        self.assertIsNone(ingest.normalize_phone("2015 - 2019"))
+        self.assertIsNone(ingest.normalize_phone("ext 123-4567"))
+        self.assertIsNone(ingest.normalize_phone("020 7946 0958"))
+
+
+class TestMapEntities(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        with open(CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["nlp"].update({"analysis_level": "basic", "skill_taxonomy": None,
+                           "skill_taxonomy_source": None, "skill_threshold": 0.0})
+        path = os.path.join(cls.tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(raw, f)
+        cls.processor = NLPProcessor(config_store=ConfigStore(path))
+        # Entity ruler in place of the statistical NER, same labels as the deep pipeline
+        cls.nlp = spacy.blank("en")
+        cls.nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": "Jane Doe"},
+            {"label": "DEGREE", "pattern": "MSc"},
+            {"label": "ORG", "pattern": "Edinburgh University"},
+        ])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_fields_come_from_the_doc(self):
+        fields = ingest.map_entities(self.nlp(RESUME), self.processor)
+        self.assertEqual(fields["name"], "Jane Doe")
+        self.assertEqual(fields["email"], "jane.doe@example.com")
+        self.assertEqual(fields["phone"], "+442079460958")
+        self.assertEqual(fields["skills"], ["Machine Learning", "Data Analysis"])
+        self.assertEqual(fields["education"], [
+            {"degree": "MSc", "institution": "Edinburgh University", "graduation_year": 2014}])
+        self.assertEqual(fields["certifications"], ["AWS Certified Solutions Architect"])
+
+    def test_missing_entities_are_left_to_model_defaults(self):
+        fields = ingest.map_entities(self.nlp("Nothing useful here"), self.processor)
+        self.assertNotIn("name", fields)
+        self.assertNotIn("email", fields)
+        self.assertEqual(fields["education"], [])
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmpdir.name, "records.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_save_load_round_trip_and_fingerprint_check(self):
+        checkpoint = ingest.Checkpoint(f"{self.out}.checkpoint", "abc")
+        self.assertFalse(checkpoint.load())
+        checkpoint.state.update(processed=3, records=2, rejects=1, out_bytes=10, rejects_bytes=5)
+        checkpoint.save()
+
+        resumed = ingest.Checkpoint(f"{self.out}.checkpoint", "abc")
+        self.assertTrue(resumed.load())
+        self.assertEqual(resumed.state, checkpoint.state)
+        with self.assertRaises(SystemExit):
+            ingest.Checkpoint(f"{self.out}.checkpoint", "other").load()
+
+    def test_open_output_truncates_to_checkpoint_and_appends(self):
+        with ingest.open_output(self.out, 0) as f:
+            f.write(b"kept\n")
+            checkpointed = f.tell()
+            f.write(b"written after the checkpoint\n")
+        with ingest.open_output(self.out, checkpointed) as f:
+            f.write(b"resumed\n")
+        with open(self.out, "rb") as f:
+            self.assertEqual(f.read(), b"kept\nresumed\n")
+
+    def test_read_inputs_resumes_at_index_and_reports_unreadable_files(self):
+        paths = []
+        for name, content in (("a.txt", "first"), ("b.html", "<p>second</p>")):
+            paths.append(os.path.join(self.tmpdir.name, name))
+            with open(paths[-1], "w") as f:
+                f.write(content)
+        paths.append(os.path.join(self.tmpdir.name, "missing.txt"))
+
+        items = list(ingest.read_inputs(paths, 1))
+        self.assertEqual([context["index"] for _, context in items], [1, 2])
+        self.assertEqual(items[0][0].strip(), "second")
+        self.assertNotIn("text", items[0][1])
+        self.assertEqual(items[1][0], "")
+        self.assertIn("error", items[1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+import yaml
+
+from backend.ats_analyzer import ATSAnalyzer
+from backend.jd_matcher import JobDescriptionMatcher
+from utils.config import ConfigStore
+from utils.nlp_processor import BASIC, NLPProcessor
+from utils.skill_taxonomy import SkillTaxonomy
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+AXES = {"python": 0, "docker": 1, "kubernetes": 2, "sql": 3, "go": 4, "kafka": 5}
+
+
+def embed(texts):
+    """One axis per known word, so cosine similarity is exact word overlap."""
+    vectors = np.zeros((len(texts), len(AXES)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().replace(",", " ").split():
+            if word in AXES:
+                vectors[row, AXES[word]] += 1
+    return vectors
+
+
+class TestJobDescriptionMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = JobDescriptionMatcher(embed, ["Python", "Docker", "SQL"])
+
+    def test_match_ranks_gaps_by_importance(self):
+        units = [("Skills", "Python"), ("Experience", "Wrote SQL reports")]
+        result = self.matcher.match(["Python", "Docker", "Kubernetes"], units, weights=[1, 1, 3])
+        self.assertAlmostEqual(result["score"], 20.0)
+        self.assertEqual([gap["phrase"] for gap in result["gaps"]], ["Kubernetes", "Docker"])
+        self.assertEqual(result["coverage"][0]["closest_section"], "Skills")
+
+    def test_batched_scores_match_single_scores(self):
+        resume = ["Python", "Docker, SQL"]
+        jobs = [["Python"], ["Kubernetes", "Docker"], []]
+        many_jobs = self.matcher.score_jobs(resume, jobs)
+        single = [self.matcher.match(job, [("", u) for u in resume])["score"] for job in jobs]
+        np.testing.assert_allclose(many_jobs, single, atol=0.1)
+
+        resumes = [["Python"], [], ["Kubernetes"]]
+        many_resumes = self.matcher.score_resumes(["Python", "Kubernetes"], resumes)
+        np.testing.assert_allclose(many_resumes, [50.0, 0.0, 50.0], atol=0.1)
+
+
+class FakeConfigStore:
+    def __init__(self, keywords):
+        self.settings = SimpleNamespace(ats_keywords=tuple(keywords))
+
+    def get(self):
+        return self.settings
+
+
+class TestATSAnalyzerJDMatcher(unittest.TestCase):
+
+    def test_matcher_is_rebuilt_when_keywords_reload(self):
+        config_store = FakeConfigStore(["Python"])
+        nlp = SimpleNamespace(embed=embed, skill_taxonomy=SkillTaxonomy.from_entries([{"id": "SK1", "name": "SQL"}]))
+        analyzer = ATSAnalyzer(config_store, nlp)
+        first = analyzer.jd_matcher
+        self.assertIs(analyzer.jd_matcher, first)
+        self.assertEqual(list(first.vocabulary), ["SQL", "Python"])
+
+        config_store.settings = SimpleNamespace(ats_keywords=("Python", "Docker"))
+        second = analyzer.jd_matcher
+        self.assertIsNot(second, first)
+        self.assertEqual(list(second.vocabulary), ["SQL", "Python", "Docker"])
+
+
+class TestJobDescriptionRequirements(unittest.TestCase):
+    """Real tokenizer and config, stand-in word vectors"""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with open(CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["nlp"].update({"analysis_level": BASIC, "skill_taxonomy": None, "skill_taxonomy_source": None})
+        path = os.path.join(tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(raw, f)
+        config_store = ConfigStore(path)
+        nlp = NLPProcessor(config_store=config_store)
+        nlp.embed = embed
+        self.analyzer = ATSAnalyzer(config_store, nlp)
+
+    def test_terms_outside_the_taxonomy_are_requirements(self):
+        jd = "We need Rust, Go, gRPC, Kafka and Terraform experience"
+        result = self.analyzer.match_job_description("Skills\nKafka, Go, Python", jd)
+        self.assertEqual(result["job_phrases"], ["Rust", "Go", "gRPC", "Kafka", "Terraform"])
+        self.assertFalse(result["no_recognized_requirements"])
+        self.assertAlmostEqual(result["score"], 40.0)
+        self.assertEqual({gap["phrase"] for gap in result["gaps"]}, {"Rust", "gRPC", "Terraform"})
+
+    def test_jd_without_requirements_has_no_score(self):
+        jd = "We are hiring. You will work with us."
+        result = self.analyzer.match_job_description("Skills\nPython", jd)
+        self.assertIsNone(result["score"])
+        self.assertTrue(result["no_recognized_requirements"])
+        self.assertEqual(self.analyzer.score_against_jobs("Skills\nPython", [jd, "Python and Kafka"]), [None, 50.0])
+        self.assertEqual(self.analyzer.rank_resumes_for_job(["Skills\nPython"], jd), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from backend import services
+from utils.logging_setup import JsonFormatter, SharedRotatingFileHandler, setup_logging, stop_logging
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+
+
+class TestLoggingSetup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmpdir.name, "app.log")
+
+    def tearDown(self):
+        stop_logging()
+        self.tmpdir.cleanup()
+
+    def configure(self, **settings):
+        setup_logging({"logging": {"log_file": self.log_file, **settings}})
+
+    def read_entries(self, path=None):
+        with open(path or self.log_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_writes_json_lines_at_configured_level(self):
+        self.configure(log_level="WARNING")
+        logging.info("filtered %s", "out")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.error("Failed for %s", "alice", exc_info=True)
+        stop_logging()
+        entries = self.read_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["level"], "ERROR")
+        self.assertEqual(entries[0]["message"], "Failed for alice")
+        self.assertIn("ValueError: boom", entries[0]["exception"])
+
+    def test_rotates_by_size(self):
+        self.configure(max_size=2000, backup_count=2)
+        for i in range(100):
+            logging.warning("line %d %s", i, "x" * 50)
+        stop_logging()
+        self.assertTrue(os.path.exists(f"{self.log_file}.1"))
+        self.assertFalse(os.path.exists(f"{self.log_file}.3"))
+        self.assertEqual(self.read_entries()[-1]["message"], f"line 99 {'x' * 50}")
+
+    def test_follows_a_file_rotated_by_another_process(self):
+        handler = SharedRotatingFileHandler(self.log_file, maxBytes=10 ** 6, backupCount=2, delay=True)
+        handler.setFormatter(JsonFormatter())
+
+        def record(message):
+            return logging.LogRecord("app", logging.WARNING, __file__, 1, message, None, None)
+
+        handler.handle(record("first"))
+        os.rename(self.log_file, f"{self.log_file}.1")
+        handler.handle(record("second"))
+        self.assertEqual([e["message"] for e in self.read_entries()], ["second"])
+
+        # The path can't be reopened: the record is reported, and close() doesn't touch the old stream
+        os.remove(self.log_file)
+        os.mkdir(self.log_file)
+        with mock.patch.object(handler, "handleError") as handle_error:
+            handler.handle(record("third"))
+        handle_error.assert_called_once()
+        handler.close()
+
+    def test_pool_workers_log_through_the_pipeline(self):
+        with open(CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["logging"]["log_file"] = self.log_file
+        path = os.path.join(self.tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(raw, f)
+        with mock.patch.object(services, "Components"):
+            services.pool_init(path)
+        logging.info("from a pool worker")
+        stop_logging()
+        self.assertEqual(self.read_entries()[-1]["message"], "from a pool worker")
+
+
+if __name__ == "__main__":
+    unittest.main()
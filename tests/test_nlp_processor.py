@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import spacy
+import yaml
+
+from utils.config import ConfigStore
+from utils.nlp_processor import BASIC, DEEP, NLPProcessor
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+
+TEXT = ("Developed a machine learning service at Acme Corp. "
+        "Managed a team and improved data analysis for finance.")
+BASIC_KEYS = {"readability_score", "keyword_density", "skills", "skill_ids", "analysis_level"}
+DEEP_KEYS = BASIC_KEYS | {"action_verbs", "companies", "education"}
+
+
+def fake_deep_pipeline(self):
+    """Stand-in for the full model: no download, no parse, same call surface"""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+class TestNLPProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(CONFIG_PATH) as f:
+            self.raw = yaml.safe_load(f)
+        self.raw["nlp"].update({"skill_taxonomy": None, "skill_taxonomy_source": None, "skill_threshold": 0.0})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def processor(self, level):
+        self.raw["nlp"]["analysis_level"] = level
+        path = os.path.join(self.tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(self.raw, f)
+        return NLPProcessor(config_store=ConfigStore(path))
+
+    def test_level_resolution(self):
+        processor = self.processor(BASIC)
+        self.assertEqual(processor._resolve_level(None), BASIC)
+        self.assertEqual(processor._resolve_level(DEEP), DEEP)
+        with self.assertRaises(ValueError):
+            processor._resolve_level("thorough")
+
+    def test_unknown_configured_level_raises(self):
+        with self.assertRaises(ValueError):
+            self.processor("thorough")
+
+    @mock.patch.object(NLPProcessor, "_load_deep_pipeline", autospec=True)
+    def test_basic_mode_never_loads_the_deep_model(self, load):
+        processor = self.processor(BASIC)
+        analysis = processor.comprehensive_analysis(TEXT)
+        processor.analyze_resume_text(TEXT)
+        processor.extract_skills(TEXT)
+        load.assert_not_called()
+        self.assertIsNone(processor._deep_nlp)
+        self.assertEqual(set(analysis), BASIC_KEYS)
+        self.assertEqual(analysis["skills"], ["Machine Learning", "Data Analysis"])
+
+    def test_taxonomy_is_compiled_when_missing_or_stale(self):
+        source = os.path.join(self.tmpdir.name, "skills.yaml")
+        compiled = os.path.join(self.tmpdir.name, "skills.taxonomy")
+        with open(source, "w") as f:
+            yaml.safe_dump([{"id": "SK1", "name": "Kubernetes"}], f)
+        self.raw["nlp"].update({"skill_taxonomy": compiled, "skill_taxonomy_source": source})
+
+        processor = self.processor(BASIC)
+        self.assertEqual(processor.skill_taxonomy.source, compiled)
+        self.assertEqual([s["name"] for s in processor.extract_skills("Ran Kubernetes")], ["Kubernetes"])
+
+        with open(source, "w") as f:
+            yaml.safe_dump([{"id": "SK2", "name": "Terraform"}], f)
+        stat = os.stat(compiled)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        processor = self.processor(BASIC)
+        self.assertEqual([s["name"] for s in processor.extract_skills("Kubernetes and Terraform")], ["Terraform"])
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ["config.yaml", "skills.taxonomy", "skills.yaml"])
+
+    @mock.patch.object(NLPProcessor, "_load_deep_pipeline", fake_deep_pipeline)
+    def test_comprehensive_analysis_keys_per_level(self):
+        processor = self.processor(DEEP)
+        self.assertIsNotNone(processor._deep_nlp)
+        deep = processor.comprehensive_analysis(TEXT)
+        self.assertEqual(set(deep), DEEP_KEYS)
+        self.assertEqual(deep["analysis_level"], DEEP)
+        basic = processor.comprehensive_analysis(TEXT, BASIC)
+        self.assertEqual(set(basic), BASIC_KEYS)
+        self.assertEqual(basic["readability_score"], deep["readability_score"])
+
+
+if __name__ == "__main__":
+    unittest.main()
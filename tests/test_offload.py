@@ -0,0 +1,92 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+import yaml
+
+from backend import services
+from backend.offload import OffloadPool
+from utils.config import ConfigStore
+from utils.logging_setup import stop_logging
+from utils.profiler import profiling
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+
+
+def crash():
+    os._exit(1)
+
+
+def crash_once(marker: str) -> str:
+    """Kill the worker the first time, succeed on the retry"""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "recovered"
+
+
+def reject(value: str) -> str:
+    raise ValueError(f"bad input {value!r}")
+
+
+class TestOffloadPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        with open(CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["nlp"]["analysis_level"] = "basic"
+        raw["logging"]["log_file"] = os.path.join(cls.tmpdir.name, "app.log")
+        raw["serving"]["async"]["process_pool_size"] = 1
+        cls.config_path = os.path.join(cls.tmpdir.name, "config.yaml")
+        with open(cls.config_path, "w") as f:
+            yaml.safe_dump(raw, f)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_logging()
+        cls.tmpdir.cleanup()
+
+    def run_pool(self, scenario):
+        pool = OffloadPool(self.config_path, ConfigStore(self.config_path).get())
+        try:
+            return asyncio.run(scenario(pool))
+        finally:
+            pool.shutdown()
+
+    def test_dead_worker_is_replaced_and_the_task_retried(self):
+        marker = os.path.join(self.tmpdir.name, "crashed")
+
+        async def scenario(pool):
+            first = pool.executor
+            result = await pool.run(crash_once, marker)
+            return result, pool.executor is not first
+
+        self.assertEqual(self.run_pool(scenario), ("recovered", True))
+
+    def test_task_that_always_crashes_fails_but_the_pool_keeps_serving(self):
+        async def scenario(pool):
+            with self.assertRaises(BrokenProcessPool):
+                await pool.run(crash)
+            return await pool.run(services.pool_ping)
+
+        self.assertTrue(self.run_pool(scenario))
+
+    def test_armed_counts_come_back_when_a_profiled_task_raises(self):
+        async def scenario(pool):
+            with self.assertRaisesRegex(ValueError, "bad input 'x'"):
+                await pool.run(reject, "x")
+            return profiling.armed_targets()
+
+        profiling.restore({"tests.unused": 2})
+        try:
+            self.assertEqual(self.run_pool(scenario), {"tests.unused": 2})
+        finally:
+            profiling.take_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
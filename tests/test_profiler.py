@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.profiler import ProfilingManager, SamplingProfiler, profiled, profiling
+
+
+@profiled("tests.busy")
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+    return "done"
+
+
+class TestProfilingManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = ProfilingManager()
+        self.manager.register("target")
+        self.manager.configure({"profiling": {"enabled": True, "admin_token": "s3cret",
+                                              "interval": 0.001, "output_dir": self.tmpdir.name}})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_authorized_requires_enabled_and_matching_token(self):
+        self.assertTrue(self.manager.authorized("s3cret"))
+        self.assertFalse(self.manager.authorized("wrong"))
+        self.assertFalse(self.manager.authorized(None))
+        self.manager.configure({"profiling": {"enabled": False, "admin_token": "s3cret"}})
+        self.assertFalse(self.manager.authorized("s3cret"))
+
+    def test_arm_counts_down_per_call(self):
+        self.manager.arm("target", 2)
+        self.manager.arm("target")
+        self.assertEqual(self.manager.armed_targets(), {"target": 3})
+        self.assertEqual([self.manager._take("target") for _ in range(4)], [True, True, True, False])
+        self.assertEqual(self.manager.armed_targets(), {})
+
+    def test_arm_rejects_unknown_targets_and_disabled_profiling(self):
+        with self.assertRaises(ValueError):
+            self.manager.arm("tagret")
+        self.assertEqual(self.manager.armed_targets(), {})
+        self.manager.configure({"profiling": {"enabled": False}})
+        with self.assertRaises(RuntimeError):
+            self.manager.arm("target")
+
+    def test_take_all_hands_counts_over_and_restore_adds_them_back(self):
+        self.manager.arm("target", 2)
+        taken = self.manager.take_all()
+        self.assertEqual(taken, {"target": 2})
+        self.assertFalse(self.manager._take("target"))
+        self.manager.arm("target")
+        self.manager.restore(taken)
+        self.assertEqual(self.manager.armed_targets(), {"target": 3})
+
+    def test_window_writes_collapsed_file(self):
+        name = self.manager.start_window(0.05)
+        busy(0.15)
+        deadline = time.time() + 5
+        while not os.listdir(self.tmpdir.name) and time.time() < deadline:
+            time.sleep(0.01)
+        files = os.listdir(self.tmpdir.name)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith(name) and files[0].endswith(".collapsed"))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def test_collapsed_stack_format(self):
+        stack = SamplingProfiler._collapse(sys._getframe(), "Main;Thread")
+        frames = stack.split(";")
+        self.assertEqual(frames[0], "Main_Thread")
+        self.assertTrue(frames[-1].startswith("test_collapsed_stack_format (test_profiler.py:"))
+        profiler = SamplingProfiler()
+        profiler.samples.update({"t;a;b": 3, "t;a": 5})
+        self.assertEqual(profiler.collapsed(), "t;a 5\nt;a;b 3")
+
+    def test_profiled_call_samples_only_the_calling_thread(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profiling.configure({"profiling": {"enabled": True, "interval": 0.001, "output_dir": tmpdir}})
+            try:
+                profiling.arm("tests.busy")
+                self.assertEqual(busy(0.05), "done")
+                self.assertEqual(busy(0.0), "done")
+                files = os.listdir(tmpdir)
+                self.assertEqual(len(files), 1)
+                with open(os.path.join(tmpdir, files[0])) as f:
+                    lines = f.read().splitlines()
+                self.assertTrue(any("busy (test_profiler.py" in line for line in lines))
+                thread_name = threading.current_thread().name
+                self.assertTrue(all(line.startswith(f"{thread_name};") for line in lines))
+            finally:
+                profiling.configure({})
+
+
+if __name__ == "__main__":
+    unittest.main()
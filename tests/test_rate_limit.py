@@ -0,0 +1,65 @@
+import unittest
+
+from utils.rate_limit import SharedTokenBuckets, TokenBucket
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, capacity=4, clock=self.clock)
+
+    def test_burst_then_refill_at_rate(self):
+        self.assertTrue(all(self.bucket.try_acquire() for _ in range(4)))
+        self.assertFalse(self.bucket.try_acquire())
+        self.assertAlmostEqual(self.bucket.wait_time(), 0.5)
+        self.clock.now = 0.5
+        self.assertTrue(self.bucket.try_acquire())
+        self.assertFalse(self.bucket.try_acquire())
+
+    def test_refill_is_capped_at_capacity(self):
+        self.bucket.try_acquire(4)
+        self.clock.now = 100.0
+        self.assertTrue(self.bucket.try_acquire(4))
+        self.assertFalse(self.bucket.try_acquire())
+
+    def test_acquire_gives_up_at_timeout(self):
+        self.bucket.try_acquire(4)
+        self.assertFalse(self.bucket.acquire(timeout=0.1))
+        with self.assertRaises(ValueError):
+            self.bucket.acquire(5)
+
+
+class TestSharedTokenBuckets(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.buckets = SharedTokenBuckets(rate=2, capacity=2, slots=64, clock=self.clock)
+
+    def test_keys_have_independent_buckets(self):
+        self.assertTrue(self.buckets.try_acquire("alice") and self.buckets.try_acquire("alice"))
+        self.assertFalse(self.buckets.try_acquire("alice"))
+        self.assertAlmostEqual(self.buckets.wait_time("alice"), 0.5)
+        self.assertTrue(self.buckets.try_acquire("bob"))
+        self.assertEqual(self.buckets.tracked(), 2)
+        self.clock.now = 0.5
+        self.assertTrue(self.buckets.try_acquire("alice"))
+
+    def test_colliding_key_takes_the_slot_over_with_a_full_bucket(self):
+        buckets = SharedTokenBuckets(rate=2, capacity=2, slots=1, clock=self.clock)
+        buckets.try_acquire("alice", 2)
+        self.assertTrue(buckets.try_acquire("bob", 2))
+        self.assertEqual(buckets.tracked(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+from backend import services
+from backend.resume_refresh import RefreshCheckpoint, ResumeRefresher
+
+SETTINGS = SimpleNamespace(ats_keywords=("Python",), default_template="modern",
+                           available_templates=("modern", "classic"))
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeCollection:
+    """The slice of a pymongo collection the refresher uses"""
+
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.bulk_writes = []
+        self.fail_writes_after = None
+
+    def find(self, query, projection):
+        after = query.get("_id", {}).get("$gt")
+        return FakeCursor([
+            {key: doc[key] for key in ("_id", *projection) if key in doc}
+            for doc in self.docs.values() if after is None or doc["_id"] > after
+        ])
+
+    def bulk_write(self, operations, ordered=True):
+        if self.fail_writes_after is not None and len(self.bulk_writes) >= self.fail_writes_after:
+            raise ConnectionError("primary stepped down")
+        self.bulk_writes.append([op._filter["_id"] for op in operations])
+        for op in operations:
+            self.docs[op._filter["_id"]].update(op._doc["$set"])
+
+
+def user_data(name):
+    return {"name": name, "email": f"{name.lower()}@example.com"}
+
+
+class TestResumeRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmpdir.name, "refresh.checkpoint")
+        self.components = SimpleNamespace(
+            config_store=SimpleNamespace(get=lambda: SETTINGS),
+            resume_gen=SimpleNamespace(template_fingerprint=lambda name: f"fp-{name}"),
+            db=SimpleNamespace(resumes=None)
+        )
+        self.rendered = []
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def work(self, data, template_name, resume_id):
+        self.rendered.append(resume_id)
+        return {"pdf_path": f"generated_resumes/{resume_id}_resume.pdf", "analysis": {"score": 1}}
+
+    def refresher(self, docs=None, **kwargs):
+        if docs is not None:
+            self.components.db.resumes = FakeCollection(docs)
+        checkpoint = RefreshCheckpoint(self.checkpoint_path)
+        checkpoint.load()
+        return ResumeRefresher(self.components, "config.yaml", checkpoint, rate=1000, burst=1000,
+                               executor_factory=lambda: ThreadPoolExecutor(max_workers=2),
+                               work=self.work, **kwargs)
+
+    def current_hash(self, data, template="modern"):
+        return services.content_hash(data, f"fp-{template}.html", SETTINGS.ats_keywords)
+
+    def test_unchanged_hash_is_skipped_and_stale_resumes_are_written_back(self):
+        fresh, stale = ObjectId(), ObjectId()
+        docs = [
+            {"_id": fresh, "user_data": user_data("Ann"), "template": "modern",
+             "content_hash": self.current_hash(user_data("Ann"))},
+            {"_id": stale, "user_data": user_data("Ann"), "template": "classic", "content_hash": "old"},
+            {"_id": ObjectId(), "user_data": user_data("Bo"), "template": "retired"},
+        ]
+        state = self.refresher(docs).run()
+
+        self.assertEqual(self.rendered, [str(stale)])
+        self.assertEqual((state["scanned"], state["refreshed"], state["skipped"], state["failed"]), (3, 1, 1, 1))
+        collection = self.components.db.resumes
+        self.assertEqual(collection.bulk_writes, [[stale]])
+        refreshed = collection.docs[stale]
+        self.assertEqual(refreshed["pdf_path"], f"generated_resumes/{stale}_resume.pdf")
+        self.assertEqual(refreshed["content_hash"], self.current_hash(user_data("Ann"), "classic"))
+        self.assertEqual(refreshed["template"], "classic")
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_interrupted_run_resumes_after_the_last_written_page(self):
+        ids = [ObjectId() for _ in range(5)]
+        docs = [{"_id": resume_id, "user_data": user_data(f"U{i}"), "template": "modern"}
+                for i, resume_id in enumerate(ids)]
+        first = self.refresher(docs, batch_size=2)
+        self.components.db.resumes.fail_writes_after = 1
+        with self.assertRaises(ConnectionError):
+            first.run()
+        self.assertEqual(RefreshCheckpoint(self.checkpoint_path).load(), True)
+
+        self.rendered.clear()
+        self.components.db.resumes.fail_writes_after = None
+        state = self.refresher(batch_size=2).run()
+        self.assertEqual(self.rendered, [str(resume_id) for resume_id in ids[2:]])
+        self.assertEqual(state["refreshed"], 5)
+        self.assertEqual(self.components.db.resumes.bulk_writes, [ids[:2], ids[2:4], ids[4:]])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_dry_run_counts_without_rendering_or_writing(self):
+        docs = [{"_id": ObjectId(), "user_data": user_data("Cy"), "template": "modern"}]
+        state = self.refresher(docs, dry_run=True).run()
+        self.assertEqual(state["refreshed"], 1)
+        self.assertEqual(self.rendered, [])
+        self.assertEqual(self.components.db.resumes.bulk_writes, [])
+
+
+class TestRefreshResume(unittest.TestCase):
+
+    def test_renders_pdf_named_by_id_without_a_preview(self):
+        calls = {}
+
+        def generate_resume(data, template_name, html_content, output_name=None):
+            calls["output_name"] = output_name
+            return f"generated_resumes/{output_name}_resume.pdf"
+
+        def no_preview(data):
+            raise AssertionError("the refresh job must not build the HTML preview")
+
+        components = SimpleNamespace(
+            config_store=SimpleNamespace(get=lambda: SETTINGS),
+            resume_gen=SimpleNamespace(render_html=lambda data, name: "<h1>Ann</h1><p>Python</p>",
+                                       generate_resume=generate_resume, get_html_preview=no_preview,
+                                       template_fingerprint=lambda name: f"fp-{name}"),
+            ats_analyzer=SimpleNamespace(full_analysis=lambda text, domain=None: {"text": text})
+        )
+        result = services.refresh_resume(components, user_data("Ann"), "modern", "abc123")
+        self.assertEqual(calls["output_name"], "abc123")
+        self.assertEqual(result["pdf_path"], "generated_resumes/abc123_resume.pdf")
+        self.assertIn("Python", result["analysis"]["text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from utils.skill_taxonomy import SkillTaxonomy, compile_taxonomy, simple_tokenize
+
+ENTRIES = [
+    {"id": "SK1", "name": "Machine Learning", "aliases": ["ML"]},
+    {"id": "SK2", "name": "Machine Learning Operations", "aliases": ["MLOps"]},
+    {"id": "SK3", "name": "Project Management", "aliases": [{"text": "PM", "confidence": 0.5}]},
+    {"id": "SK4", "name": "C++"},
+]
+
+
+class TestSkillTaxonomy(unittest.TestCase):
+
+    def setUp(self):
+        self.taxonomy = SkillTaxonomy.from_entries(ENTRIES)
+
+    def extract(self, text, threshold=0.0):
+        return self.taxonomy.extract(simple_tokenize(text), threshold)
+
+    def test_multi_word_phrases_and_aliases_map_to_ids(self):
+        matches = self.extract("Applied machine learning and C++ in production; ml models")
+        self.assertEqual([m.skill_id for m in matches], ["SK1", "SK4"])
+        self.assertEqual(matches[0].name, "Machine Learning")
+
+    def test_longest_match_wins(self):
+        matches = self.extract("Ran machine learning operations for the platform")
+        self.assertEqual([m.skill_id for m in matches], ["SK2"])
+
+    def test_threshold_filters_low_confidence_aliases(self):
+        self.assertEqual([m.skill_id for m in self.extract("PM for two years")], ["SK3"])
+        self.assertEqual(self.extract("PM for two years", threshold=0.85), [])
+
+    def test_low_confidence_long_alias_does_not_hide_shorter_match(self):
+        taxonomy = SkillTaxonomy.from_entries(ENTRIES + [
+            {"id": "SK5", "name": "ML Project", "aliases": [{"text": "machine learning project", "confidence": 0.5}]},
+        ])
+        tokens = simple_tokenize("machine learning project delivered")
+        self.assertEqual([m.skill_id for m in taxonomy.extract(tokens, 0.85)], ["SK1"])
+        self.assertEqual([m.skill_id for m in taxonomy.extract(tokens)], ["SK5"])
+
+    def test_memory_mapped_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "skills.taxonomy")
+            with open(path, "wb") as f:
+                f.write(compile_taxonomy(ENTRIES))
+            taxonomy = SkillTaxonomy.open(path)
+            self.assertEqual(taxonomy.skill_count, 4)
+            self.assertEqual(taxonomy.skill(1), ("SK2", "Machine Learning Operations"))
+            matches = taxonomy.extract(simple_tokenize("MLOps"), 0.85)
+            self.assertEqual([m.skill_id for m in matches], ["SK2"])
+
+    def test_rejects_foreign_files(self):
+        with self.assertRaises(ValueError):
+            SkillTaxonomy(b"NOPE" + b"\0" * 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Pattern, Tuple
+
+import yaml
+
+REQUIRED_SECTIONS = ("app", "database", "storage", "chatbot", "ats", "templates", "nlp")
+
+
+class ConfigError(ValueError):
+    """Raised when config.yaml is missing required settings or has the wrong shape."""
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _string_list(raw: Dict[str, Any], section: str, key: str, required: bool = True) -> Tuple[str, ...]:
+    values = raw.get(section, {}).get(key)
+    if values is None and not required:
+        return ()
+    if not isinstance(values, list) or not all(isinstance(v, str) and v.strip() for v in values):
+        raise ConfigError(f"{section}.{key} must be a list of non-empty strings")
+    if required and not values:
+        raise ConfigError(f"{section}.{key} must not be empty")
+    return tuple(v.strip() for v in values)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable, validated snapshot of config.yaml plus the structures derived from it.
+
+    Supports ``settings["section"]["key"]`` access to the raw (read-only) values so
+    it can stand in wherever the parsed YAML dict was used before."""
+
+    raw: Mapping[str, Any]
+    mtime_ns: int
+    domains: Tuple[str, ...]
+    domain_lookup: Mapping[str, str]
+    experience_levels: Tuple[str, ...]
+    experience_lookup: Mapping[str, str]
+    skip_keywords: FrozenSet[str]
+    ats_keywords: Tuple[str, ...]
+    ats_keywords_lower: Tuple[str, ...]
+    required_sections: Tuple[str, ...]
+    section_patterns: Tuple[Tuple[str, Pattern], ...]
+    allowed_extensions: FrozenSet[str]
+    available_templates: Tuple[str, ...]
+    default_template: str
+
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.raw.get(key, default)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any], mtime_ns: int = 0) -> "Settings":
+        if not isinstance(raw, dict):
+            raise ConfigError("config.yaml must contain a mapping at the top level")
+        missing = [section for section in REQUIRED_SECTIONS if not isinstance(raw.get(section), dict)]
+        if missing:
+            raise ConfigError(f"Missing config sections: {', '.join(missing)}")
+        if not isinstance(raw["app"].get("port"), int):
+            raise ConfigError("app.port must be an integer")
+        if not isinstance(raw["storage"].get("max_file_size_bytes"), int):
+            raise ConfigError("storage.max_file_size_bytes must be an integer")
+
+        domains = _string_list(raw, "chatbot", "domains")
+        experience_levels = _string_list(raw, "chatbot", "experience_levels")
+        ats_keywords = _string_list(raw, "ats", "keywords")
+        required_sections = _string_list(raw, "ats", "required_sections")
+        templates = _string_list(raw, "templates", "available_templates")
+        default_template = raw["templates"].get("default_template") or templates[0]
+        if default_template not in templates:
+            raise ConfigError(f"templates.default_template '{default_template}' is not an available template")
+
+        return cls(
+            raw=_freeze(raw),
+            mtime_ns=mtime_ns,
+            domains=domains,
+            domain_lookup=MappingProxyType({d.lower(): d for d in domains}),
+            experience_levels=experience_levels,
+            experience_lookup=MappingProxyType({e.lower(): e for e in experience_levels}),
+            skip_keywords=frozenset(k.lower() for k in _string_list(raw, "chatbot", "skip_keywords", required=False)),
+            ats_keywords=ats_keywords,
+            ats_keywords_lower=tuple(kw.lower() for kw in ats_keywords),
+            required_sections=required_sections,
+            section_patterns=tuple(
+                (section, re.compile(rf"\b{re.escape(section)}\b", re.IGNORECASE))
+                for section in required_sections
+            ),
+            allowed_extensions=frozenset(
+                "." + ext.lower().lstrip(".") for ext in _string_list(raw, "storage", "allowed_extensions")
+            ),
+            available_templates=templates,
+            default_template=default_template,
+        )
+
+
+class ConfigStore:
+    """Owns the current ``Settings`` snapshot and hot-reloads it when the file changes.
+
+    Readers call ``get()`` and always receive a complete snapshot: a reload builds
+    and validates a new ``Settings`` first and then swaps a single reference, so a
+    request sees either the old config or the new one. An invalid edit is logged
+    and the previous snapshot stays in service."""
+
+    def __init__(self, path: str = "config.yaml", check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._failed_mtime_ns: Optional[int] = None
+        self._snapshot = self._load()
+        self._next_check = time.monotonic() + check_interval
+
+    def _load(self) -> Settings:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"{self.path} not found. Please ensure it exists in the root directory.")
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        with open(self.path) as f:
+            raw = yaml.safe_load(f)
+        return Settings.from_dict(raw, mtime_ns)
+
+    def get(self) -> Settings:
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._check_for_changes(now)
+        return self._snapshot
+
+    def _check_for_changes(self, now: float) -> None:
+        # Only one thread stats the file; everyone else keeps reading the current snapshot
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = now + self.check_interval
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                logging.error("Config check failed, keeping previous settings: %s", e)
+                return
+            if mtime_ns in (self._snapshot.mtime_ns, self._failed_mtime_ns):
+                return
+            try:
+                self._snapshot = self._load()
+                self._failed_mtime_ns = None
+                logging.info("Reloaded configuration from %s", self.path)
+            except (OSError, yaml.YAMLError, ConfigError) as e:
+                self._failed_mtime_ns = mtime_ns
+                logging.error("Config reload failed, keeping previous settings: %s", e)
+        finally:
+            self._lock.release()
+
+    def reload(self) -> Settings:
+        """Force a reload, raising if the file is invalid."""
+        with self._lock:
+            self._snapshot = self._load()
+            self._failed_mtime_ns = None
+            self._next_check = time.monotonic() + self.check_interval
+            return self._snapshot
+
+
+_default_store: Optional[ConfigStore] = None
+_default_lock = threading.Lock()
+
+
+def get_config_store(path: str = "config.yaml") -> ConfigStore:
+    """Shared store for components constructed without an injected one."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ConfigStore(path)
+        return _default_store
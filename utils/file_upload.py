@@ -50,7 +50,7 @@ class FileUploader:
             return save_path
 
         except Exception as e:
-            logging.error(f"File upload error: {str(e)}")
+            logging.error("File upload error: %s", e)
             raise
 
     def _optimize_image(self, img):
@@ -0,0 +1,146 @@
+"""Non-blocking application logging.
+
+Request threads only append the ``LogRecord`` to an in-process queue; message
+formatting, JSON encoding and file I/O all happen on one background
+``QueueListener`` thread that writes to a size-rotated file. Because formatting is
+deferred, log calls must pass arguments %-style (``logging.info("x=%s", x)``) and
+not mutate those arguments afterwards.
+
+Pre-fork servers (gunicorn ``preload_app``) start the pipeline in the master; a
+fork hook gives every worker its own queue and listener, and the file handler
+reopens the log after another worker has rotated it, so workers can share one
+file.
+"""
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
+
+from utils.config import Settings
+
+DEFAULT_LOG_FILE = "./logs/app.log"
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that follows the file when another process rotated it"""
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is not None:
+            try:
+                rotated = os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                self.stream.close()
+                # Cleared first: if reopening fails, the next emit retries instead of writing to a closed file
+                self.stream = None
+                self.stream = self._open()
+        return super().shouldRollover(record)
+
+
+class _EnqueueOnlyHandler(QueueHandler):
+    """Enqueue the record untouched; the listener thread does all the formatting"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class LoggingPipeline:
+    """Root-logger QueueHandler plus the listener thread that drains it"""
+
+    def __init__(self):
+        self.settings: Dict[str, Any] = {}
+        self.listener: Optional[QueueListener] = None
+        self.queue_handler: Optional[QueueHandler] = None
+        self._fork_hook_registered = False
+
+    def start(self, settings: Dict[str, Any]) -> QueueListener:
+        self.stop()
+        self.settings = dict(settings)
+        log_file = self.settings.get("log_file", DEFAULT_LOG_FILE)
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+
+        file_handler = SharedRotatingFileHandler(
+            log_file,
+            maxBytes=int(self.settings.get("max_size", DEFAULT_MAX_SIZE)),
+            backupCount=int(self.settings.get("backup_count", DEFAULT_BACKUP_COUNT)),
+            encoding="utf-8",
+            delay=True
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = _EnqueueOnlyHandler(log_queue)
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(str(self.settings.get("log_level", "INFO")).upper())
+
+        self.listener = QueueListener(log_queue, file_handler)
+        self.listener.start()
+        if not self._fork_hook_registered:
+            os.register_at_fork(after_in_child=self._after_fork)
+            atexit.register(self.stop)
+            self._fork_hook_registered = True
+        return self.listener
+
+    def stop(self) -> None:
+        """Flush everything queued so far and close the file"""
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+        if self.queue_handler is not None:
+            logging.getLogger().removeHandler(self.queue_handler)
+            self.queue_handler = None
+
+    def _after_fork(self) -> None:
+        # The parent's listener thread doesn't exist in the child; start a fresh pipeline
+        if self.listener is not None:
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+            self.start(self.settings)
+
+
+_pipeline = LoggingPipeline()
+
+
+def setup_logging(config: Settings) -> QueueListener:
+    """Route all logging through the queue pipeline using the ``logging`` section of config.yaml"""
+    return _pipeline.start(config.get("logging", {}) or {})
+
+
+def stop_logging() -> None:
+    _pipeline.stop()
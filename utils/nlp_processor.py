@@ -1,48 +1,199 @@
+import numpy as np
 import spacy
-from spacy.matcher import Matcher
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 import logging
+import os
 import re
+import threading
+from utils.config import ConfigStore, get_config_store
+from utils.profiler import profiled
+from utils.skill_taxonomy import SkillMatch, SkillTaxonomy, compile_taxonomy, load_taxonomy_source, write_taxonomy
+
+BASIC = "basic"
+DEEP = "deep"
+ANALYSIS_LEVELS = (BASIC, DEEP)
+
+# Deep-pipeline components each kind of analysis needs; the rest are disabled per call
+ENTITY_PIPES = frozenset({"tok2vec", "ner", "entity_ruler"})
+DEPENDENCY_PIPES = frozenset({"tok2vec", "tagger", "attribute_ruler", "lemmatizer", "parser"})
+
+DENSITY_KEYWORDS = frozenset({"develop", "manage", "improve", "create"})
+
+# Capitalized JD boilerplate (bullet openers, headings) that is never a requirement itself
+JD_FILLER_WORDS = frozenset({
+    "ability", "bachelor", "bonus", "build", "degree", "design", "develop", "developer", "engineer",
+    "excellent", "experience", "familiarity", "good", "hands", "join", "junior", "knowledge", "must",
+    "nice", "plus", "preferred", "proficiency", "qualifications", "required", "requirements",
+    "responsibilities", "responsible", "role", "senior", "skills", "solid", "strong", "team", "work",
+    "working", "years",
+})
+MAX_TERM_TOKENS = 3
+
+# Used when neither a compiled taxonomy nor its source file is configured
+DEFAULT_SKILLS = [
+    {"id": "SK0001", "name": "Machine Learning"},
+    {"id": "SK0002", "name": "Project Management"},
+    {"id": "SK0003", "name": "Data Analysis"},
+]
 
 class NLPProcessor:
-    def __init__(self, model_name="en_core_web_lg"):
+    """Resume text analysis at two depths.
+
+    ``basic`` work (readability, keyword density) only needs tokens and sentence
+    boundaries, so it runs on a blank English tokenizer plus the rule-based
+    sentencizer: no tagger, parser, NER or word vectors. The full model is loaded
+    lazily and only used for analyses that need entities or dependencies, with the
+    components they don't need disabled for that call. ``nlp.analysis_level`` in
+    config.yaml picks the default depth."""
+
+    def __init__(self, model_name: Optional[str] = None, config_store: Optional[ConfigStore] = None):
+        nlp_config = (config_store or get_config_store()).get()["nlp"]
+        self.model_name = model_name or nlp_config.get("model", "en_core_web_lg")
+        self.analysis_level = nlp_config.get("analysis_level", DEEP)
+        if self.analysis_level not in ANALYSIS_LEVELS:
+            raise ValueError(f"nlp.analysis_level must be one of {ANALYSIS_LEVELS}, got {self.analysis_level!r}")
+
+        self.fast_nlp = spacy.blank("en")
+        self.fast_nlp.add_pipe("sentencizer")
+        self.skill_threshold = float(nlp_config.get("skill_threshold", 0.0))
+        self.skill_taxonomy = self._load_skill_taxonomy(nlp_config)
+        self._deep_nlp = None
+        self._deep_lock = threading.Lock()
+        if self.analysis_level == DEEP:
+            # Load now so a pre-fork warmup shares the model with every worker
+            self.nlp
+
+    @property
+    def nlp(self):
+        """Full spaCy pipeline, loaded on first use"""
+        if self._deep_nlp is None:
+            with self._deep_lock:
+                if self._deep_nlp is None:
+                    self._deep_nlp = self._load_deep_pipeline()
+        return self._deep_nlp
+
+    def _load_deep_pipeline(self):
         try:
-            self.nlp = spacy.load(model_name)
-            self._add_custom_patterns()
+            nlp = spacy.load(self.model_name)
         except OSError:
-            logging.error(f"SpaCy model {model_name} not found. Installing...")
-            spacy.cli.download(model_name)
-            self.nlp = spacy.load(model_name)
-            
-        self.skill_pattern = self._create_skill_pattern()
+            logging.error("SpaCy model %s not found. Installing...", self.model_name)
+            spacy.cli.download(self.model_name)
+            nlp = spacy.load(self.model_name)
+        self._add_custom_patterns(nlp)
+        return nlp
+
+    def _load_skill_taxonomy(self, nlp_config: Dict) -> SkillTaxonomy:
+        """Map the compiled taxonomy, (re)compiling it first when the source is newer.
+
+        Runs during warmup, so under a pre-fork server the master compiles once and
+        every worker maps the same file."""
+        compiled = nlp_config.get("skill_taxonomy")
+        source = nlp_config.get("skill_taxonomy_source")
+        if not (source and os.path.exists(source)):
+            if compiled and os.path.exists(compiled):
+                return SkillTaxonomy.open(compiled)
+            return SkillTaxonomy.from_entries(DEFAULT_SKILLS, self.tokenize)
+        if compiled and os.path.exists(compiled) and os.stat(compiled).st_mtime_ns >= os.stat(source).st_mtime_ns:
+            return SkillTaxonomy.open(compiled)
+
+        data = compile_taxonomy(load_taxonomy_source(source), self.tokenize)
+        if compiled:
+            try:
+                write_taxonomy(data, compiled)
+                logging.info("Compiled skill taxonomy %s from %s", compiled, source)
+                return SkillTaxonomy.open(compiled)
+            except OSError as e:
+                logging.warning("Could not write compiled skill taxonomy %s (%s); using it in memory", compiled, e)
+        return SkillTaxonomy(data, source)
 
-    def _add_custom_patterns(self):
+    def tokenize(self, text: str) -> List[str]:
+        """Lower-cased tokens exactly as the taxonomy compiler sees them"""
+        return [token.lower_ for token in self.fast_nlp.make_doc(text) if not token.is_space]
+
+    def candidate_terms(self, text: str) -> List[str]:
+        """Technology and product names the taxonomy may not know, in order of mention.
+
+        Runs of up to ``MAX_TERM_TOKENS`` name-like tokens: capitalized mid-sentence
+        (so "Go" counts but a sentence-opening "We" does not), or mixed-case, digits or
+        ``+#.`` inside the word ("gRPC", "S3", "C++"). Tokenizer and sentencizer only."""
+        terms, run = [], []
+        for token in self.fast_nlp(text):
+            if self._is_term_token(token):
+                run.append(token.text)
+                if len(run) < MAX_TERM_TOKENS:
+                    continue
+            if run:
+                terms.append(" ".join(run))
+                run = []
+        if run:
+            terms.append(" ".join(run))
+        return terms
+
+    @staticmethod
+    def _is_term_token(token) -> bool:
+        word = token.text
+        if token.is_punct or token.like_num or not any(ch.isalpha() for ch in word):
+            return False
+        if token.lower_ in JD_FILLER_WORDS:
+            return False
+        if any(ch.isupper() or ch.isdigit() or ch in "+#." for ch in word.rstrip(".")[1:]):
+            return True
+        if not word[0].isupper() or word == "I":
+            return False
+        return not (token.is_stop and token.is_sent_start)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Mean static word vector per text from the full model's vector table (tokenizer only, no pipeline)"""
+        nlp = self.nlp
+        if not texts:
+            return np.zeros((0, nlp.vocab.vectors_length), dtype=np.float32)
+        return np.vstack([nlp.make_doc(text).vector for text in texts]).astype(np.float32, copy=False)
+
+    def _add_custom_patterns(self, nlp):
         # Add resume-specific entity recognition
-        ruler = self.nlp.add_pipe("entity_ruler")
+        ruler = nlp.add_pipe("entity_ruler")
         patterns = [
             {"label": "DEGREE", "pattern": [{"LOWER": {"IN": ["bsc", "msc", "phd"]}}]},
             {"label": "COMPANY", "pattern": [{"ENT_TYPE": "ORG"}]}
         ]
         ruler.add_patterns(patterns)
 
-    def _create_skill_pattern(self):
-        matcher = Matcher(self.nlp.vocab)
-        skills = ["machine learning", "project management", "data analysis"]
-        for skill in skills:
-            matcher.add(skill, [[{"LOWER": skill}]])
-        return matcher
+    def _resolve_level(self, level: Optional[str]) -> str:
+        level = level or self.analysis_level
+        if level not in ANALYSIS_LEVELS:
+            raise ValueError(f"Unknown analysis level: {level}")
+        return level
+
+    def _deep_doc(self, text: str, needed: frozenset):
+        nlp = self.nlp
+        return nlp(text, disable=[name for name in nlp.pipe_names if name not in needed])
 
+    @profiled("NLPProcessor.extract_entities")
     def extract_entities(self, text: str) -> Dict:
-        doc = self.nlp(text)
+        return self._entities(self._deep_doc(text, ENTITY_PIPES))
+
+    def _entities(self, doc) -> Dict:
         return {
-            "skills": self._extract_skills(doc),
+            **self._skill_fields(doc),
             "companies": self._extract_companies(doc),
             "education": self._extract_education(doc)
         }
 
-    def _extract_skills(self, doc):
-        matches = self.skill_pattern(doc)
-        return list(set(doc[start:end].text for _, start, end in matches))
+    def extract_skills(self, text: str) -> List[Dict]:
+        """Canonical skills found in the text, tokenizer only"""
+        return [match._asdict() for match in self.skill_matches(self.fast_nlp.make_doc(text))]
+
+    def skill_matches(self, doc) -> List[SkillMatch]:
+        """Taxonomy matches over any parsed doc (the fast tokenizer's or a pipeline's)"""
+        tokens = [token.lower_ for token in doc if not token.is_space]
+        return self.skill_taxonomy.extract(tokens, self.skill_threshold)
+
+    def _skill_fields(self, doc) -> Dict:
+        matches = self.skill_matches(doc)
+        return {
+            "skills": [match.name for match in matches],
+            "skill_ids": [match.skill_id for match in matches]
+        }
 
     def _extract_companies(self, doc):
         return list(set(ent.text for ent in doc.ents if ent.label_ == "ORG"))
@@ -50,24 +201,44 @@ class NLPProcessor:
     def _extract_education(self, doc):
         return list(set(ent.text for ent in doc.ents if ent.label_ == "DEGREE"))
 
-    def analyze_resume_text(self, text: str) -> Dict:
-        doc = self.nlp(text)
+    @profiled("NLPProcessor.analyze_resume_text")
+    def analyze_resume_text(self, text: str, level: Optional[str] = None) -> Dict:
+        level = self._resolve_level(level)
+        analysis = self._text_statistics(self.fast_nlp(text))
+        if level == DEEP:
+            analysis["action_verbs"] = self._find_action_verbs(self._deep_doc(text, DEPENDENCY_PIPES))
+        return analysis
+
+    @profiled("NLPProcessor.comprehensive_analysis")
+    def comprehensive_analysis(self, text: str, level: Optional[str] = None) -> Dict:
+        """Statistics and skills for every request; entities and action verbs only in deep mode, from one parse"""
+        level = self._resolve_level(level)
+        fast_doc = self.fast_nlp(text)
+        analysis = self._text_statistics(fast_doc)
+        analysis.update(self._skill_fields(fast_doc))
+        if level == DEEP:
+            doc = self._deep_doc(text, ENTITY_PIPES | DEPENDENCY_PIPES)
+            analysis["action_verbs"] = self._find_action_verbs(doc)
+            analysis["companies"] = self._extract_companies(doc)
+            analysis["education"] = self._extract_education(doc)
+        analysis["analysis_level"] = level
+        return analysis
+
+    def _text_statistics(self, doc) -> Dict:
         return {
             "readability_score": self._calculate_readability(doc),
-            "keyword_density": self._calculate_keyword_density(doc),
-            "action_verbs": self._find_action_verbs(doc)
+            "keyword_density": self._calculate_keyword_density(doc)
         }
 
     def _calculate_readability(self, doc):
         # Simple Flesch-Kincaid approximation
-        sentence_count = len(list(doc.sents))
+        sentence_count = len(list(doc.sents)) or 1
         word_count = len(doc)
         return (206.835 - 1.015 * (word_count/sentence_count) - 84.6 * (len(doc)/(word_count or 1)))
 
     def _calculate_keyword_density(self, doc):
-        keywords = ["develop", "manage", "improve", "create"]
-        matches = [token.text.lower() for token in doc if token.text.lower() in keywords]
+        matches = [token.lower_ for token in doc if token.lower_ in DENSITY_KEYWORDS]
         return len(matches) / len(doc) if len(doc) > 0 else 0
 
     def _find_action_verbs(self, doc):
-        return [token.lemma_ for token in doc if token.pos_ == "VERB" and token.dep_ == "ROOT"]
\ No newline at end of file
+        return [token.lemma_ for token in doc if token.pos_ == "VERB" and token.dep_ == "ROOT"]
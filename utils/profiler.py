@@ -0,0 +1,209 @@
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+
+class SamplingProfiler:
+    """Background thread that samples Python stacks and aggregates them
+    in collapsed-stack form (``frame;frame;frame count``), the input
+    format of flamegraph.pl, speedscope and inferno."""
+
+    def __init__(self, interval: float = 0.005, thread_ids: Optional[Set[int]] = None,
+                 name: str = "profile"):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.name = name
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f"sampler-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self.started_at is not None:
+            self.duration = time.perf_counter() - self.started_at
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if self.thread_ids is not None and thread_id not in self.thread_ids:
+                continue
+            self.samples[self._collapse(frame, thread_names.get(thread_id, str(thread_id)))] += 1
+        self.sample_count += 1
+
+    @staticmethod
+    def _collapse(frame, thread_name: str) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(thread_name.replace(";", "_"))
+        return ";".join(reversed(stack))
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def write(self, output_dir: str) -> str:
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in self.name)
+        path = os.path.join(output_dir, f"{safe_name}_{timestamp}.collapsed")
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+            f.write("\n")
+        return path
+
+
+class ProfilingManager:
+    """Opt-in profiling surface shared by the request hooks, the admin
+    endpoint and the ``@profiled`` call sites.
+
+    While profiling is disabled or nothing is armed, ``profiled`` call sites
+    cost a single attribute check and no sampler thread exists."""
+
+    def __init__(self):
+        self.enabled = False
+        self.interval = 0.005
+        self.output_dir = os.path.join("logs", "profiles")
+        self.header = "X-Profile"
+        self.max_seconds = 60
+        self._admin_token = ""
+        self._armed: Dict[str, int] = {}
+        self._targets: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        settings = config.get("profiling", {}) or {}
+        self.enabled = bool(settings.get("enabled", False))
+        self.interval = float(settings.get("interval", self.interval))
+        self.output_dir = settings.get("output_dir", self.output_dir)
+        self.header = settings.get("header", self.header)
+        self.max_seconds = int(settings.get("max_seconds", self.max_seconds))
+        self._admin_token = str(settings.get("admin_token", "") or "")
+        if not self.enabled:
+            with self._lock:
+                self._armed.clear()
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Profiling is only reachable when enabled and a non-empty admin token matches."""
+        if not self.enabled or not self._admin_token or not token:
+            return False
+        return hmac.compare_digest(token, self._admin_token)
+
+    def register(self, target: str) -> None:
+        self._targets.add(target)
+
+    def targets(self) -> Set[str]:
+        return set(self._targets)
+
+    def arm(self, target: str, count: int = 1) -> None:
+        """Profile the next ``count`` calls of a ``@profiled`` target."""
+        if not self.enabled:
+            raise RuntimeError("Profiling is disabled")
+        if target not in self._targets:
+            # An unknown target would never be taken and keep every call site on the slow path
+            raise ValueError(f"Unknown profiling target {target!r}; known targets: {', '.join(sorted(self._targets))}")
+        with self._lock:
+            self._armed[target] = self._armed.get(target, 0) + max(1, count)
+
+    def armed_targets(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._armed)
+
+    def take_all(self) -> Dict[str, int]:
+        """Remove and return every armed count (handed to another process, see ``restore``)"""
+        with self._lock:
+            armed, self._armed = self._armed, {}
+            return armed
+
+    def restore(self, armed: Dict[str, int]) -> None:
+        """Add back counts taken with ``take_all``, here or in another process"""
+        with self._lock:
+            for target, count in armed.items():
+                self._armed[target] = self._armed.get(target, 0) + count
+
+    def _take(self, target: str) -> bool:
+        with self._lock:
+            remaining = self._armed.get(target, 0)
+            if remaining <= 0:
+                return False
+            if remaining == 1:
+                del self._armed[target]
+            else:
+                self._armed[target] = remaining - 1
+            return True
+
+    def start(self, name: str, thread_ids: Optional[Set[int]] = None) -> SamplingProfiler:
+        return SamplingProfiler(self.interval, thread_ids, name).start()
+
+    def finish(self, profiler: SamplingProfiler) -> str:
+        profiler.stop()
+        path = profiler.write(self.output_dir)
+        logging.info("Profile %s written to %s (%d samples, %.3fs)",
+                     profiler.name, path, profiler.sample_count, profiler.duration)
+        return path
+
+    @contextmanager
+    def profile(self, name: str, thread_ids: Optional[Set[int]] = None) -> Iterator[SamplingProfiler]:
+        profiler = self.start(name, thread_ids)
+        try:
+            yield profiler
+        finally:
+            self.finish(profiler)
+
+    def start_window(self, seconds: float) -> str:
+        """Sample every thread for ``seconds`` in the background; returns the profile name."""
+        if not self.enabled:
+            raise RuntimeError("Profiling is disabled")
+        seconds = min(max(float(seconds), self.interval), self.max_seconds)
+        profiler = self.start(f"window_{seconds:g}s")
+        timer = threading.Timer(seconds, self.finish, args=(profiler,))
+        timer.daemon = True
+        timer.start()
+        return profiler.name
+
+
+profiling = ProfilingManager()
+
+
+def profiled(target: str) -> Callable:
+    """Decorator making a call site profilable via ``profiling.arm(target)``."""
+    profiling.register(target)
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiling._armed or not profiling._take(target):
+                return func(*args, **kwargs)
+            with profiling.profile(target, thread_ids={threading.get_ident()}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -24,7 +24,7 @@ class ProgressTracker:
             )
             return self.user_progress[session_id]
         except Exception as e:
-            logging.error(f"Progress tracking error: {str(e)}")
+            logging.error("Progress tracking error: %s", e)
             return 0
 
     def get_progress(self, session_id: str) -> float:
@@ -0,0 +1,118 @@
+import multiprocessing
+import threading
+import time
+from hashlib import blake2b
+from typing import Callable, Optional, Tuple
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``.
+
+    ``try_acquire`` never blocks; ``acquire`` sleeps until tokens are available or
+    ``timeout`` runs out. Tokens are refilled lazily from the elapsed time, so an
+    idle bucket costs nothing."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` could be taken (0 if available now)."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.capacity}")
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining < wait:
+                    return False
+            time.sleep(wait)
+
+
+class SharedTokenBuckets:
+    """Token buckets for many keys in shared memory, usable across forked processes.
+
+    A fixed table of ``slots`` buckets lives in ``multiprocessing`` shared memory;
+    a key maps to one slot by hash. When a different key lands on an occupied
+    slot it takes the slot over with a full bucket, which is what a brand-new key
+    gets anyway, so eviction never makes the limit stricter. Create the table
+    before forking (gunicorn ``preload_app``) so every worker sees the same one."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, slots: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self.slots = max(1, int(slots))
+        self._clock = clock
+        self._tags = multiprocessing.RawArray("Q", self.slots)
+        self._tokens = multiprocessing.RawArray("d", self.slots)
+        self._updated = multiprocessing.RawArray("d", self.slots)
+        self._lock = multiprocessing.Lock()
+
+    def _slot(self, key: str) -> Tuple[int, int]:
+        digest = int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.slots, digest or 1
+
+    def _refill(self, key: str) -> int:
+        """Index of ``key``'s bucket with tokens brought up to date; caller holds the lock"""
+        index, tag = self._slot(key)
+        now = self._clock()
+        if self._tags[index] != tag:
+            self._tags[index] = tag
+            self._tokens[index] = self.capacity
+        else:
+            self._tokens[index] = min(self.capacity, self._tokens[index] + (now - self._updated[index]) * self.rate)
+        self._updated[index] = now
+        return index
+
+    def try_acquire(self, key: str, tokens: float = 1.0) -> bool:
+        with self._lock:
+            index = self._refill(key)
+            if self._tokens[index] >= tokens:
+                self._tokens[index] -= tokens
+                return True
+            return False
+
+    def wait_time(self, key: str, tokens: float = 1.0) -> float:
+        """Seconds until ``key`` could take ``tokens`` (0 if available now)."""
+        with self._lock:
+            index = self._refill(key)
+            return max(0.0, (tokens - self._tokens[index]) / self.rate)
+
+    def tracked(self) -> int:
+        """Slots currently holding a key"""
+        with self._lock:
+            return sum(1 for tag in self._tags if tag)
@@ -0,0 +1,233 @@
+"""Skill taxonomy compiled to a compact binary file and matched straight from mmap.
+
+A taxonomy lists skills with a stable ID, a canonical name and aliases. The
+offline compiler (scripts/compile_skill_taxonomy.py) tokenizes every name and
+alias, hashes each lower-cased token sequence to 64 bits and writes sorted hash
+arrays. At startup the file is memory-mapped rather than parsed, so opening a
+taxonomy of any size takes milliseconds and every worker process shares the same
+page-cache pages.
+
+Matching has ``PhraseMatcher(attr="LOWER")`` semantics: phrases match whole
+token sequences, longest match wins, and matches don't overlap. Tokens must come
+from the same tokenizer used at compile time (spaCy's English tokenizer in
+production).
+
+File layout (little-endian, every array 8-byte aligned)::
+
+    header      magic "SKTX", version, max phrase length, counts, blob size
+    phrase_keys uint64[n_phrases]   sorted phrase hashes
+    first_keys  uint64[n_first]     sorted hashes of phrase-initial tokens
+    phrase_ids  uint32[n_phrases]   skill index per phrase
+    phrase_conf uint16[n_phrases]   alias confidence * 10000
+    offsets     uint32[n_skills+1]  skill record offsets into the blob
+    blob        utf-8 "<id>\\x1f<name>" records
+"""
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from bisect import bisect_left
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+
+MAGIC = b"SKTX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+CONFIDENCE_SCALE = 10000
+DEFAULT_ALIAS_CONFIDENCE = 0.9
+RECORD_SEPARATOR = "\x1f"
+
+Tokenizer = Callable[[str], List[str]]
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    name: str
+    confidence: float
+    start: int
+    end: int
+
+
+def simple_tokenize(text: str) -> List[str]:
+    """Dependency-free tokenizer for tests and benchmarks; production compiles with spaCy's."""
+    return re.findall(r"\w+(?:[.+#-]\w+)*[+#]*|[^\w\s]", text.lower())
+
+
+def phrase_key(tokens: Sequence[str]) -> int:
+    digest = blake2b(" ".join(tokens).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def load_taxonomy_source(path: str) -> List[Dict[str, Any]]:
+    """Read a taxonomy from YAML (a list of entries) or JSON Lines (one entry per line)."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        entries = yaml.safe_load(f)
+    if isinstance(entries, dict):
+        entries = entries.get("skills", [])
+    return entries or []
+
+
+def compile_taxonomy(entries: Iterable[Dict[str, Any]], tokenize: Tokenizer = simple_tokenize) -> bytes:
+    """Compile taxonomy entries into the binary format described in the module docstring.
+
+    Each entry has ``id``, ``name`` and optional ``aliases``; an alias is a string
+    (confidence ``DEFAULT_ALIAS_CONFIDENCE``) or ``{"text": ..., "confidence": ...}``.
+    The canonical name always has confidence 1.0. When two skills share a phrase
+    the higher confidence wins."""
+    skills: List[Tuple[str, str]] = []
+    phrases: Dict[int, Tuple[int, int]] = {}
+    first_keys = set()
+    max_len = 0
+
+    for entry in entries:
+        skill_id, name = str(entry["id"]), str(entry["name"])
+        if RECORD_SEPARATOR in skill_id or RECORD_SEPARATOR in name:
+            raise ValueError(f"Skill {skill_id!r} contains a reserved separator character")
+        index = len(skills)
+        skills.append((skill_id, name))
+        variants = [(name, 1.0)]
+        for alias in entry.get("aliases") or []:
+            if isinstance(alias, dict):
+                variants.append((str(alias["text"]), float(alias.get("confidence", DEFAULT_ALIAS_CONFIDENCE))))
+            else:
+                variants.append((str(alias), DEFAULT_ALIAS_CONFIDENCE))
+        for text, confidence in variants:
+            tokens = [t.lower() for t in tokenize(text) if t.strip()]
+            if not tokens:
+                continue
+            if not 0.0 <= confidence <= 1.0:
+                raise ValueError(f"Alias {text!r} of {skill_id} has confidence outside [0, 1]")
+            key = phrase_key(tokens)
+            scaled = int(round(confidence * CONFIDENCE_SCALE))
+            if key not in phrases or phrases[key][1] < scaled:
+                phrases[key] = (index, scaled)
+            first_keys.add(phrase_key(tokens[:1]))
+            max_len = max(max_len, len(tokens))
+
+    if max_len > 0xFFFF:
+        raise ValueError("Phrase too long")
+    ordered = sorted(phrases.items())
+    blob = bytearray()
+    offsets = [0]
+    for skill_id, name in skills:
+        blob += f"{skill_id}{RECORD_SEPARATOR}{name}".encode("utf-8")
+        offsets.append(len(blob))
+
+    sections = [
+        struct.pack(f"<{len(ordered)}Q", *(key for key, _ in ordered)),
+        struct.pack(f"<{len(first_keys)}Q", *sorted(first_keys)),
+        struct.pack(f"<{len(ordered)}I", *(index for _, (index, _) in ordered)),
+        struct.pack(f"<{len(ordered)}H", *(conf for _, (_, conf) in ordered)),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        bytes(blob),
+    ]
+    out = bytearray(HEADER.pack(MAGIC, VERSION, max_len, len(ordered), len(first_keys), len(skills), len(blob)))
+    for section in sections:
+        out += b"\0" * (_align(len(out)) - len(out))
+        out += section
+    return bytes(out)
+
+
+def write_taxonomy(data: bytes, path: str) -> None:
+    """Write a compiled taxonomy, then rename it into place so running workers never map a half-written file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SkillTaxonomy:
+    """Read-only view over a compiled taxonomy held in an mmap or bytes buffer."""
+
+    def __init__(self, buffer, source: Optional[str] = None):
+        if sys.byteorder != "little":
+            raise RuntimeError("Compiled skill taxonomies are little-endian only")
+        self.source = source
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, version, self.max_phrase_len, n_phrases, n_first, n_skills, blob_len = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{source or 'buffer'} is not a version {VERSION} skill taxonomy")
+
+        offset = HEADER.size
+        sections = []
+        for count, fmt, width in ((n_phrases, "Q", 8), (n_first, "Q", 8), (n_phrases, "I", 4),
+                                  (n_phrases, "H", 2), (n_skills + 1, "I", 4)):
+            offset = _align(offset)
+            sections.append(view[offset:offset + count * width].cast(fmt))
+            offset += count * width
+        self._phrase_keys, self._first_keys, self._phrase_ids, self._phrase_conf, self._offsets = sections
+        offset = _align(offset)
+        self._blob = view[offset:offset + blob_len]
+        self.skill_count = n_skills
+        self.phrase_count = n_phrases
+
+    @classmethod
+    def open(cls, path: str) -> "SkillTaxonomy":
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict[str, Any]], tokenize: Tokenizer = simple_tokenize) -> "SkillTaxonomy":
+        return cls(compile_taxonomy(entries, tokenize))
+
+    @staticmethod
+    def _find(keys, key: int) -> int:
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return index
+        return -1
+
+    def skill(self, index: int) -> Tuple[str, str]:
+        """(skill_id, canonical name) for a skill index"""
+        record = bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8")
+        skill_id, _, name = record.partition(RECORD_SEPARATOR)
+        return skill_id, name
+
+    def match_tokens(self, tokens: Sequence[str], threshold: float = 0.0) -> List[SkillMatch]:
+        """Greedy longest-first, non-overlapping phrase matches at or above ``threshold`` over lower-cased tokens."""
+        min_confidence = int(round(threshold * CONFIDENCE_SCALE))
+        matches = []
+        n_tokens = len(tokens)
+        start = 0
+        while start < n_tokens:
+            if self._find(self._first_keys, phrase_key(tokens[start:start + 1])) < 0:
+                start += 1
+                continue
+            for length in range(min(self.max_phrase_len, n_tokens - start), 0, -1):
+                index = self._find(self._phrase_keys, phrase_key(tokens[start:start + length]))
+                # A longer phrase below the threshold must not hide a shorter one above it
+                if index >= 0 and self._phrase_conf[index] >= min_confidence:
+                    break
+            else:
+                start += 1
+                continue
+            skill_id, name = self.skill(self._phrase_ids[index])
+            matches.append(SkillMatch(skill_id, name, self._phrase_conf[index] / CONFIDENCE_SCALE, start, start + length))
+            start += length
+        return matches
+
+    def extract(self, tokens: Sequence[str], threshold: float = 0.0) -> List[SkillMatch]:
+        """Highest-confidence match per skill, ordered by position."""
+        best: Dict[str, SkillMatch] = {}
+        for match in self.match_tokens(tokens, threshold):
+            current = best.get(match.skill_id)
+            if current is None or match.confidence > current.confidence:
+                best[match.skill_id] = match
+        return sorted(best.values(), key=lambda m: m.start)